@@ -4,6 +4,8 @@ Uses AWS Lambda Power Tools for API Gateway integration
 """
 
 import os
+from decimal import Decimal
+import orjson
 from aws_lambda_powertools import Logger, Tracer, Metrics
 from aws_lambda_powertools.event_handler import APIGatewayRestResolver, CORSConfig
 from aws_lambda_powertools.utilities.typing import LambdaContext
@@ -104,8 +106,25 @@ ADMIN_API_KEY_PREFIXES = [
 AUTH_BYPASS_HEADER = "x-retool-header"
 AUTH_BYPASS_VALUE = get_secret("RETOOL_BYPASS_VALUE", "9f2b7c4a6d1e8f30b5a9c2e7d4f1a6bc")
 
+
+def _json_default(obj):
+    """Fallback for types orjson doesn't handle; mirrors Powertools' Encoder."""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _serialize_response(body) -> str:
+    """Response body serializer: orjson instead of the resolver's stdlib json.dumps.
+
+    OPT_NON_STR_KEYS keeps stdlib behaviour of stringifying int/float dict keys.
+    """
+    return orjson.dumps(body, default=_json_default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
 # Create API Gateway resolver with CORS enabled
 app = APIGatewayRestResolver(
+    serializer=_serialize_response,
     cors=CORSConfig(
         allow_origin="*",  # Allows all origins (use specific domain in production)
         extra_origins=["http://localhost:4200", "http://localhost:3000", "https://yumdude.com"],
@@ -284,7 +303,7 @@ def auth_middleware(handler, event, context):
 @middleware_handler
 @logger.inject_lambda_context(log_event=True)
 @tracer.capture_lambda_handler
-@metrics.log_metrics(capture_cold_start_metric=True)
+@metrics.log_metrics(capture_cold_start_metric=False)
 def lambda_handler(event: dict, context: LambdaContext) -> dict:
     """
     Main Lambda handler function
@@ -1,6 +1,7 @@
 """Address model"""
 from typing import Optional
 from utils.geohash import encode as geohash_encode
+from utils.dynamodb_helpers import coordinate_to_dynamodb
 
 
 class Address:
@@ -88,8 +89,8 @@ class Address:
             "addressId": {"S": self.address_id},
             "label": {"S": self.label},
             "address": {"S": self.address},
-            "lat": {"N": str(self.lat)},
-            "lng": {"N": str(self.lng)},
+            "lat": {"N": coordinate_to_dynamodb(self.lat)},
+            "lng": {"N": coordinate_to_dynamodb(self.lng)},
             "geohash": {"S": self.geohash}
         }
         if self.geocoded_address:
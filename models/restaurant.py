@@ -1,4 +1,5 @@
 """Restaurant model"""
+from functools import cached_property
 from typing import Optional, List, Union
 from utils.geohash import encode as geohash_encode
 from utils.datetime_ist import now_ist_iso
@@ -124,7 +125,17 @@ class Restaurant:
         return f"RESTAURANT#{self.restaurant_id}"
     
     def to_dict(self) -> dict:
-        """Convert to dictionary"""
+        """Convert to dictionary (fresh shallow copy, safe for callers to extend)"""
+        return dict(self._base_dict)
+
+    @cached_property
+    def _base_dict(self) -> dict:
+        """API representation, built once per instance.
+
+        Restaurant attributes are not mutated after construction (updates go
+        through RestaurantService and produce new instances), so repeated
+        to_dict() calls on cached instances only pay for a dict copy.
+        """
         result = {
             "restaurantId": self.restaurant_id,
             "name": self.name,
@@ -247,9 +258,11 @@ class Restaurant:
     
     def to_dynamodb_item(self) -> dict:
         """Convert to DynamoDB item format"""
+        # Main-table and GSI sort keys are the same string; marshal it once
+        sk_attr = {"S": self.sk}
         item = {
             "PK": {"S": self.pk},
-            "SK": {"S": self.sk},
+            "SK": sk_attr,
             "restaurantId": {"S": self.restaurant_id},
             "name": {"S": self.name},
             "locationId": {"S": self.location_id},
@@ -259,11 +272,11 @@ class Restaurant:
             "cuisine": {"L": [{"S": c} for c in self.cuisine]} if self.cuisine else {"L": []},
             "geohash": {"S": self.geohash},
             "GSI1PK": {"S": self.gsi1pk},
-            "GSI1SK": {"S": self.gsi1sk},
+            "GSI1SK": sk_attr,
             "GSI2PK": {"S": self.gsi2pk},
-            "GSI2SK": {"S": self.gsi2sk},
+            "GSI2SK": sk_attr,
             "GSI3PK": {"S": self.gsi3pk},
-            "GSI3SK": {"S": self.gsi3sk}
+            "GSI3SK": sk_attr
         }
         
         if self.rating is not None:
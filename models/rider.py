@@ -1,11 +1,20 @@
 """Rider operational model for real-time tracking"""
 from typing import Optional, List
 from utils.geohash import encode as geohash_encode
+from utils.dynamodb_helpers import coordinate_to_dynamodb
 from utils.datetime_ist import now_ist_iso
 
 
 class Rider:
     """Rider operational model - lightweight for frequent location updates"""
+
+    # Riders are built in bulk (assignment fan-out, paged listing); slots keep
+    # each instance small. Add new attributes here as well as in __init__.
+    __slots__ = (
+        'rider_id', 'phone', 'lat', 'lng', 'speed', 'heading', 'timestamp', 'is_active',
+        'rating', 'rated_count', 'working_on_order', 'last_seen', 'orders_assigned_last_7d',
+        'assignment_window_start', 'first_name', 'last_name', 'geohash', 'geohash_4', 'geohash_2',
+    )
     
     def __init__(
         self,
@@ -143,9 +152,9 @@ class Rider:
         }
         
         if self.lat is not None:
-            item["lat"] = {"N": str(self.lat)}
+            item["lat"] = {"N": coordinate_to_dynamodb(self.lat)}
         if self.lng is not None:
-            item["lng"] = {"N": str(self.lng)}
+            item["lng"] = {"N": coordinate_to_dynamodb(self.lng)}
         if self.speed is not None:
             item["speed"] = {"N": str(self.speed)}
         if self.heading is not None:
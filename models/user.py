@@ -10,6 +10,17 @@ class User:
     RIDER_STATUS_SIGNUP_DONE = "SIGNUP_DONE"
     RIDER_STATUS_APPROVED = "APPROVED"
     RIDER_STATUS_REJECTED = "REJECTED"
+
+    # Users are materialized in bulk by the rider listing and broadcast scans.
+    # Keep in step with __init__ when adding fields.
+    __slots__ = (
+        'phone', 'name', 'email', 'role', 'is_active', 'created_at', 'date_of_birth',
+        'fcm_token', 'fcm_token_updated_at', 'lat', 'lng', 'geohash', 'disable_cod', 'force_cod',
+        'referral_code', 'referred_by_code', 'referred_by_phone',
+        'rider_id', 'first_name', 'last_name', 'address', 'aadhar_number', 'aadhar_image_base64',
+        'aadhar_image_url', 'pan_number', 'pan_image_base64', 'pan_image_url', 'rider_status',
+        'rejection_reason', 'approved_at', 'upi_id',
+    )
     
     def __init__(
         self,
@@ -62,7 +62,9 @@ def register_analytics_routes(app):
         updated > 7 days ago — FCM frequently rotates tokens after that.
         """
         try:
-            restaurants = RestaurantService.list_restaurants()
+            restaurants = RestaurantService.list_restaurants(attributes=[
+                'SK', 'geohash', 'name', 'fcmToken', 'fcmTokens', 'fcmTokenUpdatedAt'
+            ])
 
             STALE_THRESHOLD_HOURS = 24 * 7
             now = datetime.now(timezone.utc)
@@ -30,10 +30,12 @@ def register_earnings_routes(app):
         
         Query params:
         - period: today | week | month (default: today)
+        - breakdown: false to omit dailyBreakdown for week/month (totals only)
         """
         try:
             query_params = app.current_event.query_string_parameters or {}
             period = query_params.get('period', 'today')
+            include_breakdown = query_params.get('breakdown', 'true').lower() != 'false'
             
             logger.info(f"Getting earnings for rider: {rider_id}, period: {period}")
             
@@ -51,9 +53,9 @@ def register_earnings_routes(app):
                     "dailyBreakdown": [e.to_dict() for e in today_earnings]
                 })
             elif period == 'week':
-                result = EarningsService.get_weekly_earnings(rider_id)
+                result = EarningsService.get_weekly_earnings(rider_id, include_breakdown)
             elif period == 'month':
-                result = EarningsService.get_monthly_earnings(rider_id)
+                result = EarningsService.get_monthly_earnings(rider_id, include_breakdown)
             else:
                 return {"error": "Invalid period. Use: today, week, or month"}, 400
             
@@ -10,19 +10,34 @@ from services.order_adjustment_service import (
 from models.restaurant import Restaurant
 from utils.dynamodb import generate_id, dynamodb_client, TABLES
 from utils.geohash import encode as geohash_encode
-from middleware.jwt_auth import generate_token, verify_token
-from utils.ssm import get_secret
+from middleware.jwt_auth import verify_token, JWT_SECRET_KEY
 from utils.datetime_ist import now_ist_iso
 from utils.shift_utils import validate_shift_timings, is_in_shift, get_shift_label, get_next_shift_opens_at
-import jwt
 import re
-import secrets
 
 
 logger = Logger()
 tracer = Tracer()
 metrics = Metrics()
 
+# Strips everything but ASCII letters/digits when deriving a default login username
+_USERNAME_RE = re.compile(r'[^a-zA-Z0-9]')
+
+# PUT /restaurants/<id> fields that need no validation beyond type coercion.
+# Value is the converter to apply (None = store as sent).
+_SIMPLE_UPDATE_FIELDS = {
+    'name': None,
+    'latitude': float,
+    'longitude': float,
+    'isOpen': None,
+    'restaurantImage': None,
+    'rating': float,
+    'ownerId': None,
+    'closesAt': None,
+    'opensAt': None,
+    'position': lambda v: int(v) if v is not None else None,
+}
+
 
 def register_restaurant_routes(app):
     """Register restaurant routes"""
@@ -30,6 +45,8 @@ def register_restaurant_routes(app):
     MAX_TOP_OFFER_BANNER_LENGTH = 20
     MIN_PREP_TIME_MINUTES = 5
     MAX_PREP_TIME_MINUTES = 120
+    MAX_LOGIN_USERNAME_LENGTH = 256
+    MAX_LOGIN_PASSWORD_LENGTH = 128
 
     def _normalize_top_offer_banner(value):
         if value is None:
@@ -120,12 +137,14 @@ def register_restaurant_routes(app):
                     restaurant_dict['deliveryTimeMinutes'] = total_time_mins
 
                     # Calculate delivery fee: ₹12 per km, minimum ₹60
-                    delivery_fee = max(60, int(distance_km * 12))
+                    delivery_fee = int(distance_km * 12)
+                    if delivery_fee < 60:
+                        delivery_fee = 60
                     restaurant_dict['deliveryFee'] = delivery_fee
 
-                    logger.info(
-                        f"   {r.name}: {distance_km}km, prep={prep_time_mins}mins "
-                        f"→ {total_time_mins}mins, ₹{delivery_fee} delivery"
+                    logger.debug(
+                        "   %s: %skm, prep=%smins → %smins, ₹%s delivery",
+                        r.name, distance_km, prep_time_mins, total_time_mins, delivery_fee
                     )
                 else:
                     restaurant_dict['deliveryTimeMinutes'] = None
@@ -133,6 +152,7 @@ def register_restaurant_routes(app):
                 
                 restaurant_list.append(restaurant_dict)
             
+            logger.info("Listed %d restaurants", len(restaurant_list))
             metrics.add_metric(name="RestaurantsListed", unit="Count", value=1)
             
             return {
@@ -152,7 +172,8 @@ def register_restaurant_routes(app):
             # Direct lookup via the restaurantId-index GSI (ProjectionType: ALL).
             # The previous scan-and-filter only saw the first ~1MB scan page, so
             # restaurants beyond it 404'd (e.g. blank GST in the admin export).
-            restaurant = RestaurantService.get_restaurant_by_id(restaurant_id)
+            # Served from the per-container TTL cache on warm invocations.
+            restaurant = RestaurantService.get_restaurant_by_id_cached(restaurant_id)
 
             if not restaurant:
                 return {"error": "Restaurant not found"}, 404
@@ -213,7 +234,7 @@ def register_restaurant_routes(app):
             top_offer_banner, banner_error = _normalize_top_offer_banner(body.get('topOfferBanner'))
             avg_preparation_time, prep_time_error = _normalize_avg_preparation_time(body.get('avgPreparationTime'))
             
-            if not all([location_id, name, latitude is not None, longitude is not None]):
+            if not (location_id and name and latitude is not None and longitude is not None):
                 return {"error": "locationId, name, latitude, and longitude are required"}, 400
             if banner_error:
                 return banner_error
@@ -241,38 +262,33 @@ def register_restaurant_routes(app):
             
             logger.info(f"Generated geohashes - P7: {restaurant.geohash}, P6: {restaurant.geohash_6}, P5: {restaurant.geohash_5}, P4: {restaurant.geohash_4}")
             
-            created_restaurant = RestaurantService.create_restaurant(restaurant)
+            # Only the create/login paths need these; keep them off the
+            # cold-start import path shared by every other route.
+            import secrets
+            import jwt
+
+            # Build default username from restaurant name
+            cleaned = _USERNAME_RE.sub('', name or '').lower()
+            default_username = f"{cleaned}@yumdude.com"
+
+            # Accept optional credentials from request body; fallback to defaults
+            username = (body.get('username') or body.get('userName') or default_username).strip()
+
+            # Generate default 8-char URL-safe password (single 6-byte urandom read)
+            default_password = secrets.token_urlsafe(6)
+            password = body.get('password') or default_password
+
+            encrypted_password = jwt.encode({"password": password}, JWT_SECRET_KEY, algorithm="HS256")
+            encrypted_username = jwt.encode({"username": username}, JWT_SECRET_KEY, algorithm="HS256")
+
+            # Restaurant row and login entry are written in one transaction
+            created_restaurant = RestaurantService.create_restaurant_with_login(
+                restaurant,
+                f"{encrypted_username}.{encrypted_password}"
+            )
             metrics.add_metric(name="RestaurantCreated", unit="Count", value=1)
+            logger.info(f"Created restaurant login for {restaurant_id} username={username}")
 
-            # Create restaurant login entry
-            try:
-                # Build default username from restaurant name
-                cleaned = re.sub(r'[^a-zA-Z0-9]', '', name or '')
-                default_username = f"{cleaned.lower()}@yumdude.com"
-
-                # Accept optional credentials from request body; fallback to defaults
-                username = (body.get('username') or body.get('userName') or default_username).strip()
-
-                # Generate default 8-char password
-                alphabet = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
-                default_password = ''.join(secrets.choice(alphabet) for _ in range(8))
-                password = body.get('password') or default_password
-
-                jwt_secret = get_secret('JWT_SECRET_KEY', 'dev-secret-key-change-in-production')
-                encrypted_password = jwt.encode({"password": password}, jwt_secret, algorithm="HS256")
-                encrypted_username = jwt.encode({"username": username}, jwt_secret, algorithm="HS256")
-
-                dynamodb_client.put_item(
-                    TableName=TABLES['RESTAURANT_LOGIN'],
-                    Item={
-                        'userIdentity': {'S': f"{encrypted_username}.{encrypted_password}"},
-                        'restaurantId': {'S': restaurant_id}
-                    }
-                )
-                logger.info(f"Created restaurant login for {restaurant_id} username={username}")
-            except Exception as e:
-                logger.error(f"Failed to create restaurant login: {str(e)}", exc_info=True)
-            
             return created_restaurant.to_dict(), 201
         except Exception as e:
             logger.error("Error creating restaurant", exc_info=True)
@@ -290,9 +306,21 @@ def register_restaurant_routes(app):
             if not username or not password:
                 return {"error": "username and password are required"}, 400
 
-            jwt_secret = get_secret('JWT_SECRET_KEY', 'dev-secret-key-change-in-production')
-            encrypted_username = jwt.encode({"username": username}, jwt_secret, algorithm="HS256")
-            encrypted_password = jwt.encode({"password": password}, jwt_secret, algorithm="HS256")
+            # Cheap triage before any HMAC or DynamoDB work: malformed credentials
+            # can never match a stored userIdentity.
+            if (
+                not isinstance(password, str)
+                or len(username) > MAX_LOGIN_USERNAME_LENGTH
+                or len(password) > MAX_LOGIN_PASSWORD_LENGTH
+                or not username.isprintable()
+            ):
+                return {"error": "Invalid username or password"}, 400
+
+            import jwt
+            from middleware.jwt_auth import generate_token
+
+            encrypted_username = jwt.encode({"username": username}, JWT_SECRET_KEY, algorithm="HS256")
+            encrypted_password = jwt.encode({"password": password}, JWT_SECRET_KEY, algorithm="HS256")
             user_identity = f"{encrypted_username}.{encrypted_password}"
 
             response = dynamodb_client.get_item(
@@ -599,30 +627,14 @@ def register_restaurant_routes(app):
             avg_preparation_time = None
             
             
-            updates = {}
-            
-            if 'name' in body:
-                updates['name'] = body['name']
-            if 'latitude' in body:
-                updates['latitude'] = float(body['latitude'])
-            if 'longitude' in body:
-                updates['longitude'] = float(body['longitude'])
-            if 'isOpen' in body:
-                updates['isOpen'] = body['isOpen']
-            if 'restaurantImage' in body:
-                updates['restaurantImage'] = body['restaurantImage']
+            # Simple fields: copied (optionally coerced) only when present in the body
+            updates = {
+                key: convert(body[key]) if convert else body[key]
+                for key, convert in _SIMPLE_UPDATE_FIELDS.items()
+                if key in body
+            }
             if 'cuisine' in body:
                 updates['cuisine'] = body['cuisine'] if isinstance(body['cuisine'], list) else []
-            if 'rating' in body:
-                updates['rating'] = float(body['rating'])
-            if 'ownerId' in body:
-                updates['ownerId'] = body['ownerId']
-            if 'closesAt' in body:
-                updates['closesAt'] = body['closesAt']
-            if 'opensAt' in body:
-                updates['opensAt'] = body['opensAt']
-            if 'position' in body:
-                updates['position'] = int(body['position']) if body['position'] is not None else None
             if 'topOfferBanner' in body:
                 top_offer_banner, banner_error = _normalize_top_offer_banner(body.get('topOfferBanner'))
                 if banner_error:
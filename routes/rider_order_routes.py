@@ -1,6 +1,6 @@
 """Rider order management routes"""
 from aws_lambda_powertools import Logger, Tracer, Metrics
-from services.order_service import OrderService
+from services.order_service import OrderService, OrderStatusConflictError, ORDER_ATTRIBUTES
 from services.order_assignment_service import OrderAssignmentService
 from services.rider_service import RiderService
 from services.earnings_service import EarningsService
@@ -13,7 +13,8 @@ from services.payment_service import PaymentService
 from models.order import Order
 from models.payment import Payment
 from datetime import datetime, timezone
-import random
+import concurrent.futures
+import secrets
 from typing import Any, Dict, Optional
 from utils.datetime_ist import now_ist_iso, IST
 
@@ -21,6 +22,9 @@ logger = Logger()
 tracer = Tracer()
 metrics = Metrics()
 
+# Reused across warm invocations for the independent post-delivery writes.
+_side_effect_executor = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+
 
 def _effective_payment_status(payment: Payment) -> str:
     """DynamoDB rows may omit paymentStatus (parsed as ''). Treat as pending for rider COD/UPI flows."""
@@ -126,61 +130,101 @@ def _earnings_date_for_order(order: Order) -> str:
         if pickup_at.tzinfo is not None:
             pickup_at = pickup_at.astimezone(timezone.utc).replace(tzinfo=None)
         return pickup_at.strftime('%Y-%m-%d')
-    return datetime.utcnow().strftime('%Y-%m-%d')
+    return datetime.now(timezone.utc).strftime('%Y-%m-%d')
 
 
 def register_rider_order_routes(app):
     """Register rider order management routes"""
     
     @app.get("/api/v1/riders/<rider_id>/orders")
-    @tracer.capture_method
+    @tracer.capture_method(capture_response=False)
     def get_rider_orders(rider_id: str):
         """
         Get orders assigned to rider with enriched restaurant and address data
         
         Query params:
         - status: Filter by status (optional)
+        - include: Comma-separated extras; "coords" backfills pickup/delivery
+          coordinates for orders stored without them (optional)
         """
         try:
             query_params = app.current_event.query_string_parameters or {}
             status_filter = query_params.get('status')
+            include = {part.strip() for part in (query_params.get('include') or '').split(',')}
             
             logger.info(f"Getting orders for rider: {rider_id}, status: {status_filter}")
             
             # Get orders for this rider with optional status filter (DB-level filtering)
-            orders = OrderService.get_orders_by_rider(rider_id, status=status_filter)
+            orders = OrderService.get_orders_by_rider(rider_id, status=status_filter, fields=ORDER_ATTRIBUTES)
             
             # Orders are already sorted by createdAt descending from the query
             
+            # Pickup and delivery coordinates are written onto the order when it
+            # is created, so only legacy rows (or ones whose lookup failed at
+            # creation) need enriching. Fetch just those, one lookup per unique
+            # key, with the restaurant and address lookups side by side.
+            # History views don't need them at all, so the backfill only runs
+            # when the caller asks for ?include=coords.
+            needs_pickup = []
+            needs_delivery = []
+            if 'coords' in include:
+                needs_pickup = [
+                    o for o in orders
+                    if o.restaurant_id and (o.pickup_lat is None or o.pickup_lng is None or not o.pickup_address)
+                ]
+                needs_delivery = [
+                    o for o in orders
+                    if o.address_id and o.customer_phone and (o.delivery_lat is None or o.delivery_lng is None)
+                ]
+            restaurant_ids = {o.restaurant_id for o in needs_pickup}
+            address_keys = {(o.customer_phone, o.address_id) for o in needs_delivery}
+
+            restaurants_by_id = {}
+            addresses_by_key = {}
+            if restaurant_ids or address_keys:
+                with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+                    restaurants_future = executor.submit(RestaurantService.batch_get_restaurants, restaurant_ids)
+                    addresses_future = executor.submit(AddressService.batch_get_addresses, address_keys)
+
+                try:
+                    restaurants_by_id = restaurants_future.result()
+                except Exception as e:
+                    logger.error(f"Failed to fetch restaurants {sorted(restaurant_ids)}: {str(e)}")
+
+                try:
+                    addresses_by_key = addresses_future.result()
+                except Exception as e:
+                    logger.error(f"Failed to fetch {len(address_keys)} addresses: {str(e)}")
+
             # Enrich orders with restaurant and address data
+            needs_pickup_ids = {o.order_id for o in needs_pickup}
+            needs_delivery_ids = {o.order_id for o in needs_delivery}
             enriched_orders = []
             for order in orders:
                 order_dict = order.to_dict()
                 
-                # Fetch restaurant data
-                if order.restaurant_id:
-                    try:
-                        restaurant = RestaurantService.get_restaurant_by_id(order.restaurant_id)
-                        if restaurant:
-                            order_dict['pickupAddress'] = f"{restaurant.name}, {restaurant.location_id}"
-                            order_dict['pickupLat'] = restaurant.latitude
-                            order_dict['pickupLng'] = restaurant.longitude
-                            logger.info(f"Enriched order {order.order_id} with restaurant: {restaurant.name} at ({restaurant.latitude}, {restaurant.longitude})")
-                    except Exception as e:
-                        logger.error(f"Failed to fetch restaurant {order.restaurant_id}: {str(e)}")
+                restaurant = restaurants_by_id.get(order.restaurant_id) if order.order_id in needs_pickup_ids else None
+                if restaurant:
+                    order_dict['pickupAddress'] = f"{restaurant.name}, {restaurant.location_id}"
+                    order_dict['pickupLat'] = restaurant.latitude
+                    order_dict['pickupLng'] = restaurant.longitude
+                    logger.debug("Enriched order %s with restaurant: %s at (%s, %s)", order.order_id, restaurant.name, restaurant.latitude, restaurant.longitude)
                 
-                # Fetch address data
-                if order.address_id and order.customer_phone:
-                    try:
-                        address = AddressService.get_address(order.customer_phone, order.address_id)
-                        if address:
-                            order_dict['deliveryLat'] = address.lat
-                            order_dict['deliveryLng'] = address.lng
-                            logger.info(f"Enriched order {order.order_id} with address: ({address.lat}, {address.lng})")
-                    except Exception as e:
-                        logger.error(f"Failed to fetch address {order.address_id}: {str(e)}")
+                address = (
+                    addresses_by_key.get((order.customer_phone, order.address_id))
+                    if order.order_id in needs_delivery_ids else None
+                )
+                if address:
+                    order_dict['deliveryLat'] = address.lat
+                    order_dict['deliveryLng'] = address.lng
+                    logger.debug("Enriched order %s with address: (%s, %s)", order.order_id, address.lat, address.lng)
                 
                 enriched_orders.append(order_dict)
+
+            logger.info(
+                "Enriched %d orders (%d restaurants, %d addresses)",
+                len(enriched_orders), len(restaurants_by_id), len(addresses_by_key)
+            )
             
             # Include rider's own rating and count for the Orders tab (from Riders table, raw item)
             rider_rating, rider_rated_count = RiderService.get_rider_rating_and_count(rider_id)
@@ -363,25 +407,20 @@ def register_rider_order_routes(app):
                 for key, value in headers.items()
             )
 
-            # Update order status to requested status from path param
+            # Status, rider hookup, assignment timestamp and rider snapshot all
+            # go to the same order item, so write them in one update.
             new_status = status or Order.RIDER_ASSIGNED
-            order_update = {
+            now_iso = now_ist_iso()
+            update_data = {
                 'status': new_status,
-                'riderId': rider_id
+                'riderId': rider_id,
+                'riderAssignedAt': now_iso
             }
             if has_retool_header:
-                order_update['internalStatus'] = 'RIDER_FORCE_ASSIGNED'
+                update_data['internalStatus'] = 'RIDER_FORCE_ASSIGNED'
 
-            OrderService.update_order(order_id, order_update)
-            
-            # Update rider working_on_order
-            RiderService.set_working_on_order(rider_id, order_id)
-            
             # Get rider's current location and copy to order for tracking
             rider = RiderService.get_rider(rider_id)
-            update_data = {
-                'riderAssignedAt': now_ist_iso()
-            }
 
             # Snapshot rider name on the order so downstream consumers
             # (customer app, notifications, ops Retool) don't have to join
@@ -400,10 +439,24 @@ def register_rider_order_routes(app):
                     update_data['riderCurrentLng'] = rider.lng
                     update_data['riderSpeed'] = rider.speed or 0.0
                     update_data['riderHeading'] = rider.heading or 0.0
-                    update_data['riderLocationUpdatedAt'] = datetime.utcnow().isoformat()
+                    update_data['riderLocationUpdatedAt'] = now_iso
                     logger.info(f"Copied rider location to order: ({rider.lat}, {rider.lng})")
             
-            OrderService.update_order(order_id, update_data)
+            # A rider may only accept an offer still addressed to them; the
+            # condition closes the window where the offer timed out and went
+            # to someone else. Retool force-assigns skip the check.
+            try:
+                OrderService.update_order(
+                    order_id,
+                    update_data,
+                    expected=None if has_retool_header else {'riderId': rider_id}
+                )
+            except OrderStatusConflictError:
+                logger.warning(f"[orderId={order_id}] Accept by rider {rider_id} lost the race; order no longer offered to them")
+                return {"error": "Order not assigned to this rider"}, 403
+            
+            # Update rider working_on_order
+            RiderService.set_working_on_order(rider_id, order_id, rider=rider)
 
             # NOTE: No post-accept push is sent — the rider already knows they
             # accepted (they tapped Accept and got the API success response).
@@ -470,18 +523,43 @@ def register_rider_order_routes(app):
             # Only allow rejecting orders in OFFERED_TO_RIDER status
             if order.status != 'OFFERED_TO_RIDER':
                 return {"error": f"Order cannot be rejected in {order.status} status"}, 400
+
+            # Resolve where to reassign from before anything is written, so a
+            # bad order row is refused without parking it or penalizing the
+            # rider. Pickup coordinates are copied onto the order when it is
+            # created; rows older than that fall back to the restaurant.
+            restaurant_lat = order.pickup_lat
+            restaurant_lng = order.pickup_lng
+            if restaurant_lat is None or restaurant_lng is None:
+                restaurant = RestaurantService.get_restaurant_by_id_cached(order.restaurant_id)
+                if restaurant:
+                    restaurant_lat = restaurant.latitude
+                    restaurant_lng = restaurant.longitude
+            if restaurant_lat is None or restaurant_lng is None:
+                logger.error(f"[orderId={order_id}] Missing restaurant location, cannot reassign")
+                return {"error": "Missing restaurant location"}, 500
             
             # Add this rider to rejectedByRiders so they are not offered this order again
             rejected = list(order.rejected_by_riders or [])
             if rider_id not in rejected:
                 rejected.append(rider_id)
             
-            # Clear rider assignment and mark awaiting reassignment
-            OrderService.update_order(order_id, {
-                'rejectedByRiders': rejected,
-                'riderId': None,
-                'status': Order.STATUS_AWAITING_RIDER_ASSIGNMENT
-            })
+            # Clear rider assignment and mark awaiting reassignment, provided the
+            # offer is still this rider's (it may have timed out or been
+            # accepted from another device since the read above).
+            try:
+                OrderService.update_order(order_id, {
+                    'rejectedByRiders': rejected,
+                    'riderId': None,
+                    'status': Order.STATUS_AWAITING_RIDER_ASSIGNMENT
+                }, expected={'riderId': rider_id, 'status': Order.OFFERED_TO_RIDER})
+            except OrderStatusConflictError as e:
+                latest = OrderService.get_order(order_id)
+                if not latest:
+                    return {"error": "Order not found"}, 404
+                if latest.rider_id != rider_id:
+                    return {"error": "Order not assigned to this rider"}, 403
+                return {"error": f"Order cannot be rejected in {e.current_status} status"}, 400
 
             # Clear the order from rider's workingOnOrder list
             RiderService.set_working_on_order(rider_id, None)
@@ -489,19 +567,14 @@ def register_rider_order_routes(app):
             # Deduct rating for explicit rejection
             RiderService.apply_rejection_penalty(rider_id)
 
-            # Reassign to next available rider
-            restaurant_lat = order.pickup_lat
-            restaurant_lng = order.pickup_lng
-            if restaurant_lat is None or restaurant_lng is None:
-                restaurant = RestaurantService.get_restaurant_by_id(order.restaurant_id)
-                if restaurant:
-                    restaurant_lat = restaurant.latitude
-                    restaurant_lng = restaurant.longitude
-
-            if restaurant_lat is not None and restaurant_lng is not None:
-                OrderAssignmentService.assign_order_to_rider(order_id, restaurant_lat, restaurant_lng)
-            else:
-                logger.warning(f"[orderId={order_id}] Missing restaurant location, cannot reassign")
+            # Reassign to next available rider. The rider search runs in the
+            # queue consumer rather than inline:
+            # the order is already parked in AWAITING_RIDER_ASSIGNMENT, so the
+            # only step left here is a single SQS send, and the consumer
+            # retries until a rider is found.
+            OrderAssignmentService.queue_order_for_assignment(
+                order_id, restaurant_lat, restaurant_lng, order.rider_assignment_attempts or 0
+            )
             
             logger.info(f"[orderId={order_id}] Rejected by rider {rider_id}")
             metrics.add_metric(name="OrderRejectedByRider", unit="Count", value=1)
@@ -579,59 +652,76 @@ def register_rider_order_routes(app):
                         f"[orderId={order_id}] Missing/invalid riderPickupAt; storing deliveryDurationMinutes=0"
                     )
 
-                # Clear rider's working_on_order
-                RiderService.set_working_on_order(rider_id, None)
-
                 # Add to rider's earnings (order is an Order model; payouts live under revenue.*).
                 # SK is "<date>#<orderId>"; for COD orders the cash-collected handler
                 # has already written a separate negative-totalEarnings row at
                 # "<date>#COD#<orderId>" — these two rows sit side by side and sum to
                 # the rider's net payable for the order.
                 delivery_fee_portion, incentives_portion = _rider_earnings_breakdown(order)
-                EarningsService.add_delivery(
-                    rider_id,
-                    order_id,
-                    delivery_fee_portion,
-                    0.0,
-                    incentives_portion,
-                    delivery_duration_minutes=delivery_duration_minutes,
-                    date_override=_earnings_date_for_order(order),
-                )
-                try:
-                    bonus_credits = EarningsService.apply_milestone_bonuses(rider_id)
-                    if bonus_credits:
-                        logger.info(
-                            f"[orderId={order_id}] Credited milestone bonuses for rider {rider_id}: {bonus_credits}"
-                        )
-                except Exception as bonus_err:
-                    # Bonus crediting must never block delivery completion.
-                    logger.warning(
-                        f"[orderId={order_id}] Milestone bonus credit failed (non-fatal): {bonus_err}"
+
+                def _credit_rider():
+                    EarningsService.add_delivery(
+                        rider_id,
+                        order_id,
+                        delivery_fee_portion,
+                        0.0,
+                        incentives_portion,
+                        delivery_duration_minutes=delivery_duration_minutes,
+                        date_override=_earnings_date_for_order(order),
                     )
+                    # Milestones count the delivery just added, so this stays
+                    # behind add_delivery rather than running alongside it.
+                    try:
+                        bonus_credits = EarningsService.apply_milestone_bonuses(rider_id)
+                        if bonus_credits:
+                            logger.info(
+                                f"[orderId={order_id}] Credited milestone bonuses for rider {rider_id}: {bonus_credits}"
+                            )
+                    except Exception as bonus_err:
+                        # Bonus crediting must never block delivery completion.
+                        logger.warning(
+                            f"[orderId={order_id}] Milestone bonus credit failed (non-fatal): {bonus_err}"
+                        )
+
+                # Order cashback (YumCoins) + refer-and-earn fulfilment. Mirrors
+                # the milestone-bonus guard: wallet/referral side effects MUST
+                # NEVER block delivery completion.
+                def _credit_rewards():
+                    try:
+                        ReferralService.on_order_delivered(order)
+                    except Exception as reward_err:
+                        logger.warning(
+                            f"[orderId={order_id}] Cashback/referral credit failed (non-fatal): {reward_err}"
+                        )
+
+                restaurant_payout = _revenue_final_payout(order, "restaurantRevenue", "finalPayout")
+
+                # The side effects touch different tables and don't depend on each
+                # other, so run them together. All must settle before the status
+                # flips to DELIVERED; any fatal failure still surfaces as a 500.
+                side_effects = [
+                    # Clear rider's working_on_order
+                    _side_effect_executor.submit(RiderService.set_working_on_order, rider_id, None),
+                    _side_effect_executor.submit(_credit_rider),
+                    _side_effect_executor.submit(
+                        RestaurantEarningsService.add_order_earning,
+                        order.restaurant_id,
+                        order_id,
+                        restaurant_payout,
+                        date_override=delivered_at.strftime('%Y-%m-%d'),
+                    ),
+                    _side_effect_executor.submit(_credit_rewards),
+                ]
+                concurrent.futures.wait(side_effects)
+                for future in side_effects:
+                    future.result()
+
                 metrics.add_metric(
                     name="DeliveryDurationMinutes",
                     unit="Count",
                     value=delivery_duration_minutes,
                 )
 
-                restaurant_payout = _revenue_final_payout(order, "restaurantRevenue", "finalPayout")
-                RestaurantEarningsService.add_order_earning(
-                    order.restaurant_id,
-                    order_id,
-                    restaurant_payout,
-                    date_override=delivered_at.strftime('%Y-%m-%d'),
-                )
-
-                # Order cashback (YumCoins) + refer-and-earn fulfilment. Mirrors
-                # the milestone-bonus guard: wallet/referral side effects MUST
-                # NEVER block delivery completion.
-                try:
-                    ReferralService.on_order_delivered(order)
-                except Exception as reward_err:
-                    logger.warning(
-                        f"[orderId={order_id}] Cashback/referral credit failed (non-fatal): {reward_err}"
-                    )
-
             # Update order status
             OrderService.update_order_status(order_id, new_status)
             
@@ -647,4 +737,4 @@ def register_rider_order_routes(app):
 
 def generate_delivery_otp() -> str:
     """Generate 4-digit delivery OTP"""
-    return str(random.randint(1000, 9999))
+    return str(secrets.randbelow(9000) + 1000)
@@ -1,6 +1,6 @@
 """Rider routes"""
 from aws_lambda_powertools import Logger, Tracer, Metrics
-from services.rider_service import RiderService, DEFAULT_RIDER_GSI3_PARTITION
+from services.rider_service import RiderService, DEFAULT_RIDER_GSI3_PARTITION, DEFAULT_RIDER_PAGE_SIZE
 from models.rider import Rider
 from utils import normalize_phone
 from utils.dynamodb import generate_id
@@ -14,17 +14,25 @@ def register_rider_routes(app):
     """Register rider routes"""
     
     @app.get("/api/v1/riders")
-    @tracer.capture_method
     def list_riders():
-        """List all riders"""
+        """List riders one page at a time (?limit=, ?cursor=)"""
         try:
-            logger.info("Listing riders")
-            riders = RiderService.list_riders()
+            try:
+                limit = int(app.current_event.get_query_string_value(
+                    name="limit", default=str(DEFAULT_RIDER_PAGE_SIZE)
+                ))
+            except ValueError:
+                return {"error": "limit must be an integer"}, 400
+            cursor = app.current_event.get_query_string_value(name="cursor", default=None) or None
+
+            logger.info(f"Listing riders (limit={limit}, cursor={cursor})")
+            riders, next_cursor = RiderService.list_riders_page(limit=limit, cursor=cursor)
             metrics.add_metric(name="RidersListed", unit="Count", value=1)
             
             return {
                 "riders": [r.to_dict() for r in riders],
-                "total": len(riders)
+                "total": len(riders),
+                "nextCursor": next_cursor
             }, 200
         except Exception as e:
             logger.error("Error listing riders", exc_info=True)
@@ -33,7 +41,7 @@ def register_rider_routes(app):
     # NOTE: must be registered before "/api/v1/riders/<rider_id>" so the resolver
     # matches the static "active" path instead of capturing it as a rider_id.
     @app.get("/api/v1/riders/active")
-    @tracer.capture_method
+    @tracer.capture_method(capture_response=False)
     def list_active_riders():
         """List currently active (online) riders via a GSI3 query."""
         try:
@@ -55,7 +63,6 @@ def register_rider_routes(app):
             return {"error": "Failed to list active riders", "message": str(e)}, 500
 
     @app.get("/api/v1/riders/<rider_id>")
-    @tracer.capture_method
     def get_rider(rider_id: str):
         """Get rider by ID"""
         try:
@@ -105,8 +112,10 @@ def register_rider_routes(app):
             logger.error("Error creating rider", exc_info=True)
             return {"error": "Failed to create rider", "message": str(e)}, 500
     
+    # Called on every rider location heartbeat; kept out of X-Ray (along with
+    # the plain rider reads above) because the subsegment costs more than the
+    # handler's own work is worth tracing.
     @app.put("/api/v1/riders/<rider_id>/location")
-    @tracer.capture_method
     def update_rider_location(rider_id: str):
         """Update rider location"""
         try:
@@ -1,11 +1,17 @@
 """Rider signup and authentication routes"""
 import re
 import os
+import time
 import boto3
 import base64
+import binascii
+import concurrent.futures
+import functools
+from botocore.config import Config
+from typing import Optional
 from urllib.parse import urlparse, parse_qs, quote
 from aws_lambda_powertools import Logger, Tracer, Metrics
-from services.user_service import UserService
+from services.user_service import UserService, RiderAlreadyRegisteredError
 from services.rider_service import RiderService
 from models.user import User
 from models.rider import Rider
@@ -17,11 +23,140 @@ logger = Logger()
 tracer = Tracer()
 metrics = Metrics()
 
-# S3 client for presigned URLs
-s3_client = boto3.client('s3')
+# S3 client for document uploads/reads. Built on first use (most invocations
+# of this Lambda never touch S3) and then kept for the container, with a
+# keep-alive pool so warm invocations reuse the TLS connection, and short
+# timeouts so a stalled S3 call fails well inside the API Gateway limit.
+_s3_client = None
+
+
+def _get_s3_client():
+    global _s3_client
+    if _s3_client is None:
+        _s3_client = boto3.client(
+            's3',
+            config=Config(
+                max_pool_connections=50,
+                tcp_keepalive=True,
+                connect_timeout=1,
+                read_timeout=5,
+                retries={'max_attempts': 2, 'mode': 'standard'},
+            ),
+        )
+    return _s3_client
+
+
 RIDER_DOCUMENTS_BUCKET = os.environ.get('RIDER_DOCUMENTS_BUCKET', 'rider-documents-dev')
 IMAGE_CDN_BASE_URL = os.environ.get("IMAGE_CDN_BASE_URL", "").rstrip("/")
 
+# Document key layout and the prefixes that turn a key into the filePath and
+# fileUrl returned to the app.
+_DOCUMENT_KEY_TEMPLATE = "riders/{}/{}-{}.jpg"
+_DOCUMENT_PATH_PREFIX = RIDER_DOCUMENTS_BUCKET + "/"
+_DOCUMENT_CDN_PREFIX = IMAGE_CDN_BASE_URL + "/"
+
+# Shared across warm invocations for fetching a rider's documents in parallel.
+_s3_pool = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+# Shared across warm invocations for signup's independent DynamoDB lookups.
+_db_pool = concurrent.futures.ThreadPoolExecutor(max_workers=8)
+
+MAX_DOCUMENT_SIZE_MB = 10
+# Lifetime of the presigned links handed out for KYC document upload/review.
+DOCUMENT_URL_EXPIRY_SECONDS = 300
+
+# Uploads are decoded in slices of this many base64 chars (a multiple of 4) so
+# the payload is never copied whole on its way to bytes.
+_BASE64_CHUNK_CHARS = 1 << 20
+_WHITESPACE_RE = re.compile(r'\s')
+
+def _handle_errors(error: str, log_message: str, metric: Optional[str] = None):
+    """Route decorator: turn an unhandled exception into the standard 500 body.
+
+    Logs log_message with the route's path params, bumps metric (if given),
+    and returns {"error": error, "message": str(e)}, 500.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            try:
+                return fn(*args, **kwargs)
+            except Exception as e:
+                logger.error(log_message, extra=kwargs, exc_info=True)
+                if metric:
+                    metrics.add_metric(name=metric, unit="Count", value=1)
+                return {"error": error, "message": str(e)}, 500
+        return wrapper
+    return decorator
+
+
+# Per-container cache for check_rider_login: {phone: (expires_at, User)}.
+# The rider app polls it while an application is under review; approve/reject
+# in this container drop the entry, other containers see the change within
+# the TTL.
+_rider_login_cache = {}
+RIDER_LOGIN_CACHE_TTL_SECONDS = 30
+
+
+def _get_rider_user_cached(phone: str):
+    now = time.time()
+    cached = _rider_login_cache.get(phone)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    user = UserService.get_user_by_role(phone, "RIDER")
+    if user:
+        _rider_login_cache[phone] = (now + RIDER_LOGIN_CACHE_TTL_SECONDS, user)
+    return user
+
+
+# Fields signup_rider requires to be present and non-empty, in the order
+# they're reported when missing.
+_SIGNUP_REQUIRED_FIELDS = (
+    'phone', 'firstName', 'lastName', 'address',
+    'aadharNumber', 'aadharImageUrl',
+    'panNumber', 'panImageUrl',
+)
+_SIGNUP_REQUIRED_FIELD_SET = frozenset(_SIGNUP_REQUIRED_FIELDS)
+
+# KYC number formats, compiled once per container. The PAN is checked as
+# typed (any case); re.ASCII keeps IGNORECASE and \d from admitting
+# look-alike Unicode letters and digits.
+_AADHAR_RE = re.compile(r'\A\d{12}\Z', re.ASCII)
+_PAN_RE = re.compile(r'\A[A-Z]{5}\d{4}[A-Z]\Z', re.IGNORECASE | re.ASCII)
+
+
+def _decoded_base64_size(data: str, start: int) -> int:
+    """Exact decoded size of unwrapped base64 in data[start:], without decoding it."""
+    length = len(data) - start
+    padding = 0
+    if length and data.endswith('=='):
+        padding = 2
+    elif length and data.endswith('='):
+        padding = 1
+    return (length * 3) // 4 - padding
+
+
+def _decode_base64(data: str, start: int = 0) -> bytearray:
+    """Decode data[start:] into a buffer sized up front, one slice at a time.
+
+    Decoding is strict: anything outside the base64 alphabet raises
+    binascii.Error instead of being silently dropped. Line-wrapped payloads
+    (some Android encoders insert newlines) can't be sliced on 4-char
+    boundaries, so they have the whitespace stripped and take the one-shot
+    decode.
+    """
+    if _WHITESPACE_RE.search(data, start):
+        return bytearray(base64.b64decode(_WHITESPACE_RE.sub('', data[start:]), validate=True))
+
+    out = bytearray(_decoded_base64_size(data, start))
+    pos = 0
+    for i in range(start, len(data), _BASE64_CHUNK_CHARS):
+        chunk = binascii.a2b_base64(data[i:i + _BASE64_CHUNK_CHARS], strict_mode=True)
+        out[pos:pos + len(chunk)] = chunk
+        pos += len(chunk)
+    del out[pos:]
+    return out
+
 
 def register_rider_signup_routes(app):
     """Register rider signup routes"""
@@ -84,9 +219,10 @@ def register_rider_signup_routes(app):
     
     @app.post("/api/v1/riders/documents/upload")
     @tracer.capture_method
+    @_handle_errors("Failed to upload document", "Error uploading document to S3", metric="DocumentUploadFailed")
     def upload_document():
         """
-        Upload document image to S3 (backend handles upload)
+        Upload document image to S3
         
         Request body:
         {
@@ -100,70 +236,92 @@ def register_rider_signup_routes(app):
             "filePath": "bucket/riders/9876543210/aadhar-timestamp.jpg",
             "fileUrl": "https://<cdn-domain>/riders/9876543210/aadhar-timestamp.jpg"
         }
+        
+        Omit imageBase64 to upload straight to S3 instead: the response then
+        also carries "upload": {"url": ..., "fields": {...}}, a presigned POST
+        the app sends as multipart/form-data (the fields, then the JPEG as
+        "file") within "expiresIn" seconds. S3 enforces the size limit.
         """
-        try:
-            if not IMAGE_CDN_BASE_URL:
-                return {"error": "CDN base URL not configured"}, 500
-            body = app.current_event.json_body
-            
-            phone = normalize_phone(body.get('phone'))
-            document_type = body.get('documentType')
-            image_base64 = body.get('imageBase64')
-            
-            # Validation
-            if not phone:
-                return {"error": "Phone number required"}, 400
-            
-            if document_type not in ['aadhar', 'pan']:
-                return {"error": "documentType must be 'aadhar' or 'pan'"}, 400
-            
-            if not image_base64:
-                return {"error": "imageBase64 required"}, 400
-            
-            # Remove data URI prefix if present
-            if image_base64.startswith('data:'):
-                image_base64 = image_base64.split(',')[1]
-            
-            # Decode base64
-            image_data = base64.b64decode(image_base64)
-            
-            # Validate file size (max 10MB)
-            max_size_mb = 10
-            if len(image_data) > max_size_mb * 1024 * 1024:
-                return {"error": f"File size exceeds {max_size_mb}MB limit"}, 400
-            
-            # Create unique file path
-            timestamp = now_ist_strftime('%Y%m%d-%H%M%S')
-            file_key = f"riders/{phone}/{document_type}-{timestamp}.jpg"
-            
-            # Upload to S3
-            s3_client.put_object(
+        if not IMAGE_CDN_BASE_URL:
+            return {"error": "CDN base URL not configured"}, 500
+        body = app.current_event.json_body
+        
+        phone = normalize_phone(body.get('phone'))
+        document_type = body.get('documentType')
+        image_base64 = body.get('imageBase64')
+        
+        # Validation
+        if not phone:
+            return {"error": "Phone number required"}, 400
+        
+        if document_type not in ['aadhar', 'pan']:
+            return {"error": "documentType must be 'aadhar' or 'pan'"}, 400
+        
+        # Create unique file path
+        timestamp = now_ist_strftime('%Y%m%d-%H%M%S')
+        file_key = _DOCUMENT_KEY_TEMPLATE.format(phone, document_type, timestamp)
+        file_path = _DOCUMENT_PATH_PREFIX + file_key
+        file_url = _DOCUMENT_CDN_PREFIX + quote(file_key, safe='/%')
+        
+        if not image_base64:
+            # Direct upload: hand out a presigned POST. Unlike a presigned
+            # PUT, its policy can cap the object size, which matters on
+            # this unauthenticated route.
+            max_size_bytes = MAX_DOCUMENT_SIZE_MB * 1024 * 1024
+            upload = _get_s3_client().generate_presigned_post(
                 Bucket=RIDER_DOCUMENTS_BUCKET,
                 Key=file_key,
-                Body=image_data,
-                ContentType='image/jpeg',
-                ContentDisposition='inline'
+                Fields={'Content-Type': 'image/jpeg', 'Content-Disposition': 'inline'},
+                Conditions=[
+                    {'Content-Type': 'image/jpeg'},
+                    {'Content-Disposition': 'inline'},
+                    ['content-length-range', 1, max_size_bytes],
+                ],
+                ExpiresIn=DOCUMENT_URL_EXPIRY_SECONDS
             )
-            
-            # Return bucket/key path
-            file_path = f"{RIDER_DOCUMENTS_BUCKET}/{file_key}"
-            file_url = f"{IMAGE_CDN_BASE_URL}/{quote(file_key, safe='/%')}"
-            
-            logger.info(f"Uploaded {document_type} document for {phone} to S3: {file_key}")
-            metrics.add_metric(name="DocumentUploaded", unit="Count", value=1)
-            
+            logger.info("Issued %s upload URL for %s: %s", document_type, phone, file_key)
+            metrics.add_metric(name="DocumentUploadUrlIssued", unit="Count", value=1)
             return {
                 "filePath": file_path,
-                "fileUrl": file_url
+                "fileUrl": file_url,
+                "upload": upload,
+                "expiresIn": DOCUMENT_URL_EXPIRY_SECONDS
             }, 200
-            
-        except Exception as e:
-            logger.error("Error uploading document to S3", exc_info=True)
-            metrics.add_metric(name="DocumentUploadFailed", unit="Count", value=1)
-            return {"error": "Failed to upload document", "message": str(e)}, 500
+        
+        # Skip the data URI prefix if present (by offset, not by copying)
+        payload_start = image_base64.find(',') + 1 if image_base64.startswith('data:') else 0
+        
+        # Validate file size (max 10MB) from the encoded length, before decoding
+        max_size_mb = MAX_DOCUMENT_SIZE_MB
+        if _decoded_base64_size(image_base64, payload_start) > max_size_mb * 1024 * 1024:
+            return {"error": f"File size exceeds {max_size_mb}MB limit"}, 400
+        
+        # Decode base64
+        try:
+            image_data = _decode_base64(image_base64, payload_start)
+        except binascii.Error:
+            return {"error": "imageBase64 is not valid base64"}, 400
+        
+        # Upload to S3
+        _get_s3_client().put_object(
+            Bucket=RIDER_DOCUMENTS_BUCKET,
+            Key=file_key,
+            Body=image_data,
+            ContentType='image/jpeg',
+            ContentDisposition='inline'
+        )
+        
+        logger.info("Uploaded %s document for %s to S3: %s", document_type, phone, file_key)
+        metrics.add_metric(name="DocumentUploaded", unit="Count", value=1)
+        
+        return {
+            "filePath": file_path,
+            "fileUrl": file_url
+        }, 200
     
     @app.post("/api/v1/riders/signup")
     @tracer.capture_method
+    @_handle_errors("Failed to submit signup", "Error in rider signup", metric="RiderSignupFailed")
     def signup_rider():
         """
         Rider signup with KYC - Creates entries in both Users and Riders tables
@@ -185,183 +343,204 @@ def register_rider_signup_routes(app):
             "panImageUrl": "https://bucket.s3.amazonaws.com/riders/9876543210/pan.jpg"
         }
         """
-        try:
-            body = app.current_event.json_body
-            
-            # Validation - accepts document path/url and stores CDN URL (or API URL fallback)
-            required_fields = ['phone', 'firstName', 'lastName', 'address', 
-                              'aadharNumber', 'aadharImageUrl', 
-                              'panNumber', 'panImageUrl']
-            
-            for field in required_fields:
-                if not body.get(field):
-                    return {"error": f"Missing required field: {field}"}, 400
-            
-            phone = normalize_phone(body['phone'])
-            
-            # Check if rider role already exists (customer role is OK)
-            existing_rider = UserService.get_user_by_role(phone, "RIDER")
-            if existing_rider:
-                if existing_rider.rider_status == User.RIDER_STATUS_SIGNUP_DONE:
-                    return {
-                        "message": "Your application is under review",
-                        "status": "SIGNUP_DONE",
-                        "riderId": existing_rider.rider_id
-                    }, 200
-                elif existing_rider.rider_status == User.RIDER_STATUS_APPROVED:
-                    return {"error": "Phone number already registered as rider"}, 400
-            
-            # Validate Aadhar
-            if not re.match(r'^\d{12}$', body['aadharNumber']):
-                return {"error": "Invalid Aadhar number. Must be 12 digits."}, 400
-            
-            # Validate PAN
-            if not re.match(r'^[A-Z]{5}\d{4}[A-Z]$', body['panNumber'].upper()):
-                return {"error": "Invalid PAN number. Format: ABCDE1234F"}, 400
-
-            aadhar_number = body['aadharNumber']
-            pan_number = body['panNumber'].upper()
-
-            # Check if Aadhar or PAN already used by another rider
-            existing_aadhar_rider = UserService.get_rider_by_aadhar(aadhar_number)
-            if existing_aadhar_rider and existing_aadhar_rider.phone != phone:
-                return {"error": "Aadhar number already used by another rider"}, 400
-
-            existing_pan_rider = UserService.get_rider_by_pan(pan_number)
-            if existing_pan_rider and existing_pan_rider.phone != phone:
-                return {"error": "PAN number already used by another rider"}, 400
-            
-            # Generate rider ID
-            rider_id = generate_id('RDR')
-            
-            # 1. Create entry in Users table (authentication & KYC)
-            aadhar_image_api_url = _to_image_access_url(body['aadharImageUrl'])
-            pan_image_api_url = _to_image_access_url(body['panImageUrl'])
-
-            user = User(
-                phone=phone,
-                role="RIDER",
-                rider_id=rider_id,
-                first_name=body['firstName'],
-                last_name=body['lastName'],
-                address=body['address'],
-                email=(body.get('email') or '').strip() or None,
-                date_of_birth=(body.get('dateOfBirth') or '').strip() or None,
-                upi_id=(body.get('upiId') or '').strip() or None,
-                aadhar_number=aadhar_number,
-                aadhar_image_url=aadhar_image_api_url,
-                pan_number=pan_number,
-                pan_image_url=pan_image_api_url,
-                rider_status=User.RIDER_STATUS_SIGNUP_DONE,
-                is_active=False
-            )
-            
-            created_user = UserService.create_user(user)
-            logger.info(f"Created user record for rider: {phone}")
-            
-            # 2. Create entry in Riders table (operational data)
-            rider = Rider(
-                rider_id=rider_id,
-                phone=phone,
-                is_active=False,
-                lat=None,
-                lng=None,
-                speed=0.0,
-                heading=0.0,
-                working_on_order=None,
-                first_name=body['firstName'],
-                last_name=body['lastName'],
-            )
-            
-            created_rider = RiderService.create_rider(rider)
-            logger.info(f"Created rider operational record: {rider_id}")
-            
-            metrics.add_metric(name="RiderSignupSubmitted", unit="Count", value=1)
-            
-            return {
-                "phone": created_user.phone,
-                "riderId": rider_id,
-                "status": "SIGNUP_DONE",
-                "message": "Your application is under review. We'll notify you once approved (usually within 24-48 hours)."
-            }, 201
-            
-        except Exception as e:
-            logger.error("Error in rider signup", exc_info=True)
-            metrics.add_metric(name="RiderSignupFailed", unit="Count", value=1)
-            return {"error": "Failed to submit signup", "message": str(e)}, 500
+        body = app.current_event.json_body
+        
+        # Validation - accepts document path/url and stores CDN URL (or API URL fallback)
+        missing = _SIGNUP_REQUIRED_FIELD_SET.difference(k for k, v in body.items() if v)
+        if missing:
+            field = next(f for f in _SIGNUP_REQUIRED_FIELDS if f in missing)
+            return {"error": f"Missing required field: {field}"}, 400
+        
+        phone = normalize_phone(body['phone'])
+        aadhar_number = body['aadharNumber']
+        pan_raw = body['panNumber']
+        pan_number = pan_raw.upper()
 
+        # The three lookups are independent; start them together and
+        # consume them in the order the checks below need them.
+        existing_rider_future = _db_pool.submit(UserService.get_user_by_role, phone, "RIDER")
+        aadhar_rider_future = _db_pool.submit(UserService.get_rider_by_aadhar, aadhar_number)
+        pan_rider_future = _db_pool.submit(UserService.get_rider_by_pan, pan_number)
+        
+        # Check if rider role already exists (customer role is OK)
+        existing_rider = existing_rider_future.result()
+        if existing_rider:
+            if existing_rider.rider_status == User.RIDER_STATUS_SIGNUP_DONE:
+                return {
+                    "message": "Your application is under review",
+                    "status": "SIGNUP_DONE",
+                    "riderId": existing_rider.rider_id
+                }, 200
+            elif existing_rider.rider_status == User.RIDER_STATUS_APPROVED:
+                return {"error": "Phone number already registered as rider"}, 400
+        
+        # Validate Aadhar
+        if not _AADHAR_RE.match(aadhar_number):
+            return {"error": "Invalid Aadhar number. Must be 12 digits."}, 400
+        
+        # Validate PAN
+        if not _PAN_RE.match(pan_raw):
+            return {"error": "Invalid PAN number. Format: ABCDE1234F"}, 400
+
+        # Check if Aadhar or PAN already used by another rider
+        existing_aadhar_rider = aadhar_rider_future.result()
+        if existing_aadhar_rider and existing_aadhar_rider.phone != phone:
+            return {"error": "Aadhar number already used by another rider"}, 400
+
+        existing_pan_rider = pan_rider_future.result()
+        if existing_pan_rider and existing_pan_rider.phone != phone:
+            return {"error": "PAN number already used by another rider"}, 400
+        
+        # Generate rider ID
+        rider_id = generate_id('RDR')
+        
+        # 1. Users table record (authentication & KYC)
+        aadhar_image_api_url = _to_image_access_url(body['aadharImageUrl'])
+        pan_image_api_url = _to_image_access_url(body['panImageUrl'])
+
+        user = User(
+            phone=phone,
+            role="RIDER",
+            rider_id=rider_id,
+            first_name=body['firstName'],
+            last_name=body['lastName'],
+            address=body['address'],
+            email=(body.get('email') or '').strip() or None,
+            date_of_birth=(body.get('dateOfBirth') or '').strip() or None,
+            upi_id=(body.get('upiId') or '').strip() or None,
+            aadhar_number=aadhar_number,
+            aadhar_image_url=aadhar_image_api_url,
+            pan_number=pan_number,
+            pan_image_url=pan_image_api_url,
+            rider_status=User.RIDER_STATUS_SIGNUP_DONE,
+            is_active=False
+        )
+        
+        # 2. Riders table record (operational data)
+        rider = Rider(
+            rider_id=rider_id,
+            phone=phone,
+            is_active=False,
+            lat=None,
+            lng=None,
+            speed=0.0,
+            heading=0.0,
+            working_on_order=None,
+            first_name=body['firstName'],
+            last_name=body['lastName'],
+        )
+        
+        # Both rows commit together, so a failure can't leave a Users
+        # record without its Riders counterpart.
+        try:
+            created_user = UserService.create_user_and_rider_txn(user, rider)
+        except RiderAlreadyRegisteredError:
+            return {"error": "Phone number already registered as rider"}, 400
+        _rider_login_cache.pop(phone, None)
+        logger.info("Created user and rider records for rider: %s (%s)", phone, rider_id)
+        
+        metrics.add_metric(name="RiderSignupSubmitted", unit="Count", value=1)
+        
+        return {
+            "phone": created_user.phone,
+            "riderId": rider_id,
+            "status": "SIGNUP_DONE",
+            "message": "Your application is under review. We'll notify you once approved (usually within 24-48 hours)."
+        }, 201
+    
     @app.get("/api/v1/riders/<rider_id>/rating")
     @tracer.capture_method
+    @_handle_errors("Failed to fetch rating", "Error fetching rider rating")
     def get_rider_rating(rider_id: str):
         """
         Fetch rider's rating and rated count from Riders table.
         Used by the Orders tab to show rating in the header.
         """
-        try:
-            if not rider_id:
-                return {"error": "riderId is required"}, 400
-            rider_rating, rider_rated_count = RiderService.get_rider_rating_and_count(rider_id)
-            return {
-                "riderRating": rider_rating,
-                "riderRatedCount": rider_rated_count,
-            }, 200
-        except Exception as e:
-            logger.error(f"Error fetching rider rating for {rider_id}", exc_info=True)
-            return {"error": "Failed to fetch rating", "message": str(e)}, 500
+        if not rider_id:
+            return {"error": "riderId is required"}, 400
+        rider_rating, rider_rated_count = RiderService.get_rider_rating_and_count(rider_id)
+        return {
+            "riderRating": rider_rating,
+            "riderRatedCount": rider_rated_count,
+        }, 200
 
     @app.get("/api/v1/riders/<rider_id>/documents")
     @tracer.capture_method
+    @_handle_errors("Failed to fetch rider documents", "Error fetching rider documents", metric="RiderDocumentsFetchFailed")
     def get_rider_documents(rider_id: str):
         """
-        Fetch rider's Aadhar and PAN document images as base64 from S3.
+        Fetch links to rider's Aadhar and PAN document images.
+
+        Returns short-lived presigned S3 GET URLs (aadharImagePresignedUrl,
+        panImagePresignedUrl) that the client loads directly. Pass
+        ?format=base64 for the legacy inline aadharImageBase64/panImageBase64
+        fields instead.
         """
-        try:
-            if not rider_id:
-                return {"error": "riderId is required"}, 400
-
-            user = UserService.get_rider_by_rider_id(rider_id)
-            if not user:
-                return {"error": "Rider not found"}, 404
-
-            def _extract_key_parts(url: str):
-                bucket, key = _extract_bucket_key(url)
-                if not bucket or not key:
-                    return None, None
-                key_parts = key.split('/')
-                if len(key_parts) < 3:
-                    return None, None
-                return key_parts[-2], key_parts[-1]
-
-            def _get_base64_for_url(url: str):
-                mobile, filename = _extract_key_parts(url)
-                if not mobile or not filename:
-                    return None
-                key = f"riders/{mobile}/{filename}"
-                s3_object = s3_client.get_object(
-                    Bucket=RIDER_DOCUMENTS_BUCKET,
-                    Key=key
-                )
-                image_bytes = s3_object["Body"].read()
-                return base64.b64encode(image_bytes).decode("utf-8")
-
-            aadhar_base64 = _get_base64_for_url(user.aadhar_image_url)
-            pan_base64 = _get_base64_for_url(user.pan_image_url)
-
-            response = user.to_dict()
+        if not rider_id:
+            return {"error": "riderId is required"}, 400
+
+        user = UserService.get_rider_by_rider_id(rider_id)
+        if not user:
+            return {"error": "Rider not found"}, 404
+
+        # Resolved here rather than in the pool threads: boto3 client
+        # creation isn't thread-safe.
+        s3_client = _get_s3_client()
+
+        def _document_key(url: str):
+            bucket, key = _extract_bucket_key(url)
+            if not bucket or not key:
+                return None
+            key_parts = key.split('/')
+            if len(key_parts) < 3:
+                return None
+            return f"riders/{key_parts[-2]}/{key_parts[-1]}"
+
+        def _get_base64_for_key(key: str):
+            if not key:
+                return None
+            s3_object = s3_client.get_object(
+                Bucket=RIDER_DOCUMENTS_BUCKET,
+                Key=key
+            )
+            image_bytes = s3_object["Body"].read()
+            return binascii.b2a_base64(image_bytes, newline=False).decode("ascii")
+
+        def _get_presigned_url_for_key(key: str):
+            if not key:
+                return None
+            # Signed locally; no S3 round trip.
+            return s3_client.generate_presigned_url(
+                'get_object',
+                Params={'Bucket': RIDER_DOCUMENTS_BUCKET, 'Key': key},
+                ExpiresIn=DOCUMENT_URL_EXPIRY_SECONDS
+            )
+
+        aadhar_key = _document_key(user.aadhar_image_url)
+        pan_key = _document_key(user.pan_image_url)
+        response = user.to_dict()
+
+        query_params = app.current_event.query_string_parameters or {}
+        if query_params.get('format') == 'base64':
+            aadhar_future = _s3_pool.submit(_get_base64_for_key, aadhar_key)
+            pan_future = _s3_pool.submit(_get_base64_for_key, pan_key)
+            response.update({
+                "aadharImageBase64": aadhar_future.result(),
+                "panImageBase64": pan_future.result()
+            })
+        else:
             response.update({
-                "aadharImageBase64": aadhar_base64,
-                "panImageBase64": pan_base64
+                "aadharImagePresignedUrl": _get_presigned_url_for_key(aadhar_key),
+                "panImagePresignedUrl": _get_presigned_url_for_key(pan_key),
+                "presignedUrlExpiresIn": DOCUMENT_URL_EXPIRY_SECONDS
             })
 
-            metrics.add_metric(name="RiderDocumentsFetched", unit="Count", value=1)
-            return response, 200
-        except Exception as e:
-            logger.error("Error fetching rider documents", exc_info=True)
-            metrics.add_metric(name="RiderDocumentsFetchFailed", unit="Count", value=1)
-            return {"error": "Failed to fetch rider documents", "message": str(e)}, 500
+        metrics.add_metric(name="RiderDocumentsFetched", unit="Count", value=1)
+        return response, 200
     
     @app.post("/api/v1/riders/login/check")
     @tracer.capture_method
+    @_handle_errors("Failed to check login status", "Error checking rider login")
     def check_rider_login():
         """
         Check if rider can login based on verification status
@@ -374,60 +553,58 @@ def register_rider_signup_routes(app):
         3. Rejected: { "status": "REJECTED", "canLogin": false, "reason": "..." }
         4. Approved: { "status": "APPROVED", "canLogin": true, "riderId": "..." }
         """
-        try:
-            body = app.current_event.json_body
-            phone = normalize_phone(body.get('phone'))
-            
-            if not phone:
-                return {"error": "Phone number required"}, 400
-            
-            # Query Users table for RIDER authentication status
-            user = UserService.get_user_by_role(phone, "RIDER")
-            
-            if not user:
-                return {
-                    "status": "NOT_FOUND",
-                    "canLogin": False,
-                    "message": "Please signup first to become a delivery partner"
-                }, 200
-            
-            if user.rider_status == User.RIDER_STATUS_SIGNUP_DONE:
-                return {
-                    "status": "SIGNUP_DONE",
-                    "canLogin": False,
-                    "message": "Your application is under verification. We'll notify you once approved."
-                }, 200
-            
-            if user.rider_status == User.RIDER_STATUS_REJECTED:
-                return {
-                    "status": "REJECTED",
-                    "canLogin": False,
-                    "message": f"Application rejected: {user.rejection_reason or 'Please contact support'}",
-                    "reason": user.rejection_reason
-                }, 200
-            
-            if user.rider_status == User.RIDER_STATUS_APPROVED:
-                return {
-                    "status": "APPROVED",
-                    "canLogin": True,
-                    "phone": user.phone,
-                    "riderId": user.rider_id,
-                    "name": f"{user.first_name} {user.last_name}"
-                }, 200
-            
-            return {"error": "Invalid rider status"}, 500
-            
-        except Exception as e:
-            logger.error("Error checking rider login", exc_info=True)
-            return {"error": "Failed to check login status", "message": str(e)}, 500
+        body = app.current_event.json_body
+        phone = normalize_phone(body.get('phone'))
+        
+        if not phone:
+            return {"error": "Phone number required"}, 400
+        
+        # Users table RIDER authentication status (briefly cached; the app polls this)
+        user = _get_rider_user_cached(phone)
+        
+        if not user:
+            return {
+                "status": "NOT_FOUND",
+                "canLogin": False,
+                "message": "Please signup first to become a delivery partner"
+            }, 200
+        
+        if user.rider_status == User.RIDER_STATUS_SIGNUP_DONE:
+            return {
+                "status": "SIGNUP_DONE",
+                "canLogin": False,
+                "message": "Your application is under verification. We'll notify you once approved."
+            }, 200
+        
+        if user.rider_status == User.RIDER_STATUS_REJECTED:
+            return {
+                "status": "REJECTED",
+                "canLogin": False,
+                "message": f"Application rejected: {user.rejection_reason or 'Please contact support'}",
+                "reason": user.rejection_reason
+            }, 200
+        
+        if user.rider_status == User.RIDER_STATUS_APPROVED:
+            return {
+                "status": "APPROVED",
+                "canLogin": True,
+                "phone": user.phone,
+                "riderId": user.rider_id,
+                "name": f"{user.first_name} {user.last_name}"
+            }, 200
+        
+        return {"error": "Invalid rider status"}, 500
     
     @app.get("/api/v1/riders/list")
     @tracer.capture_method
+    @_handle_errors("Failed to list riders", "Error listing riders")
     def list_riders():
         """
         List riders by status
         Query Parameters:
         - status: SIGNUP_DONE (default), APPROVED, or REJECTED
+        - limit: optional; pages the scan, evaluating at most this many users
+        - cursor: nextCursor from the previous page
         
         Response:
         {
@@ -448,107 +625,112 @@ def register_rider_signup_routes(app):
                     "isActive": false
                 }
             ],
-            "count": 1
+            "count": 1,
+            "nextCursor": null
         }
         """
-        try:
-            # Get status from query parameters, default to SIGNUP_DONE (pending approval)
-            query_params = app.current_event.query_string_parameters or {}
-            status = query_params.get('status', User.RIDER_STATUS_SIGNUP_DONE)
-            
-            # Validate status
-            valid_statuses = [
-                User.RIDER_STATUS_SIGNUP_DONE,
-                User.RIDER_STATUS_APPROVED,
-                User.RIDER_STATUS_REJECTED
-            ]
-            if status not in valid_statuses:
-                return {
-                    "error": f"Invalid status. Must be one of: {', '.join(valid_statuses)}"
-                }, 400
-            
-            # Fetch riders from database
-            riders = UserService.list_riders_by_status(status)
-            
-            # Convert to dictionary format
-            riders_data = [rider.to_dict() for rider in riders]
-            
-            logger.info(f"Listed {len(riders_data)} riders with status: {status}")
-            
+        # Get status from query parameters, default to SIGNUP_DONE (pending approval)
+        query_params = app.current_event.query_string_parameters or {}
+        status = query_params.get('status', User.RIDER_STATUS_SIGNUP_DONE)
+        
+        # Validate status
+        valid_statuses = [
+            User.RIDER_STATUS_SIGNUP_DONE,
+            User.RIDER_STATUS_APPROVED,
+            User.RIDER_STATUS_REJECTED
+        ]
+        if status not in valid_statuses:
             return {
-                "riders": riders_data,
-                "count": len(riders_data),
-                "status": status
-            }, 200
-            
-        except Exception as e:
-            logger.error("Error listing riders", exc_info=True)
-            return {"error": "Failed to list riders", "message": str(e)}, 500
+                "error": f"Invalid status. Must be one of: {', '.join(valid_statuses)}"
+            }, 400
+        
+        # Fetch riders from database, converting each scan page as it arrives.
+        # Without ?limit this returns every matching rider (all scan pages).
+        limit_param = query_params.get('limit')
+        if limit_param is None:
+            riders_data = [rider.to_dict() for rider in UserService.iter_riders_by_status(status)]
+            next_cursor = None
+        else:
+            try:
+                limit = int(limit_param)
+            except ValueError:
+                return {"error": "limit must be an integer"}, 400
+            riders, next_cursor = UserService.list_riders_by_status_page(
+                status, limit, query_params.get('cursor') or None
+            )
+            riders_data = [rider.to_dict() for rider in riders]
+        
+        count = len(riders_data)
+        logger.info(
+            "Listed %d riders with status: %s", count, status,
+            extra={"riders_count": count, "rider_status": status}
+        )
+        
+        return {
+            "riders": riders_data,
+            "count": count,
+            "status": status,
+            "nextCursor": next_cursor
+        }, 200
     
     @app.put("/api/v1/riders/approve")
     @tracer.capture_method
+    @_handle_errors("Failed to approve rider", "Error approving rider")
     def approve_rider():
         """Approve rider (ops team) - Updates both Users and Riders tables"""
-        try:
-            body = app.current_event.json_body
-            phone = normalize_phone(body.get('phone'))
-            
-            if not phone:
-                return {"error": "Phone number required"}, 400
-            
-            user = UserService.get_user_by_role(phone, "RIDER")
-            if not user:
-                return {"error": "Rider not found"}, 404
-            
-            # 1. Update Users table (RIDER role)
-            UserService.update_user(phone, "RIDER", {
-                'riderStatus': User.RIDER_STATUS_APPROVED,
-                'isActive': True,
-                'approvedAt': now_ist_iso()
-            })
-            
-            # 2. Enable in Riders table (ready for order assignment, but offline by default)
-            rider = RiderService.get_rider_by_mobile(phone)
-            if rider:
-                RiderService.set_active_status(rider.rider_id, False)
-            
-            logger.info(f"Rider approved: {phone}")
-            metrics.add_metric(name="RiderApproved", unit="Count", value=1)
-            
-            return {"message": "Rider approved successfully"}, 200
-            
-        except Exception as e:
-            logger.error("Error approving rider", exc_info=True)
-            return {"error": "Failed to approve rider", "message": str(e)}, 500
+        body = app.current_event.json_body
+        phone = normalize_phone(body.get('phone'))
+        
+        if not phone:
+            return {"error": "Phone number required"}, 400
+        
+        user = UserService.get_user_by_role(phone, "RIDER")
+        if not user:
+            return {"error": "Rider not found"}, 404
+        
+        # 1. Update Users table (RIDER role)
+        UserService.update_user(phone, "RIDER", {
+            'riderStatus': User.RIDER_STATUS_APPROVED,
+            'isActive': True,
+            'approvedAt': now_ist_iso()
+        })
+        
+        # 2. Enable in Riders table (ready for order assignment, but offline by default)
+        rider = RiderService.get_rider_by_mobile(phone)
+        if rider:
+            RiderService.set_active_status(rider.rider_id, False)
+        
+        _rider_login_cache.pop(phone, None)
+        logger.info("Rider approved: %s", phone)
+        metrics.add_metric(name="RiderApproved", unit="Count", value=1)
+        
+        return {"message": "Rider approved successfully"}, 200
     
     @app.put("/api/v1/riders/reject")
     @tracer.capture_method
+    @_handle_errors("Failed to reject rider", "Error rejecting rider")
     def reject_rider():
         """Reject rider (ops team)"""
-        try:
-            body = app.current_event.json_body
-            phone = normalize_phone(body.get('phone'))
-            reason = body.get('reason', 'Document verification failed')
-            
-            if not phone:
-                return {"error": "Phone number required"}, 400
-            
-            user = UserService.get_user_by_role(phone, "RIDER")
-            if not user:
-                return {"error": "Rider not found"}, 404
-            
-            # Update Users table (RIDER role)
-            UserService.update_user(phone, "RIDER", {
-                'riderStatus': User.RIDER_STATUS_REJECTED,
-                'rejectionReason': reason,
-                'isActive': False
-            })
-            
-            logger.info(f"Rider rejected: {phone} - {reason}")
-            metrics.add_metric(name="RiderRejected", unit="Count", value=1)
-            
-            return {"message": "Rider rejected"}, 200
-            
-        except Exception as e:
-            logger.error("Error rejecting rider", exc_info=True)
-            return {"error": "Failed to reject rider", "message": str(e)}, 500
+        body = app.current_event.json_body
+        phone = normalize_phone(body.get('phone'))
+        reason = body.get('reason', 'Document verification failed')
+        
+        if not phone:
+            return {"error": "Phone number required"}, 400
+        
+        user = UserService.get_user_by_role(phone, "RIDER")
+        if not user:
+            return {"error": "Rider not found"}, 404
+        
+        # Update Users table (RIDER role)
+        UserService.update_user(phone, "RIDER", {
+            'riderStatus': User.RIDER_STATUS_REJECTED,
+            'rejectionReason': reason,
+            'isActive': False
+        })
+        
+        _rider_login_cache.pop(phone, None)
+        logger.info("Rider rejected: %s - %s", phone, reason)
+        metrics.add_metric(name="RiderRejected", unit="Count", value=1)
+        
+        return {"message": "Rider rejected"}, 200
@@ -230,32 +230,16 @@ def register_user_routes(app):
             logger.info(f"📱 Registering FCM token for: {phone[:5]}*** role={role}")
             logger.info(f"🔑 Token: {fcm_token[:30]}...")
 
-            existing_user = UserService.get_user_by_role(phone, role)
-
-            if existing_user:
-                # A fresh FCM token means the device just opened the app, so
-                # re-activate the row (logout sets isActive=False and nothing
-                # else flips it back on login — without this, any logged-out
-                # customer stays invisible to the custom broadcast handler).
-                logger.info(f"✅ Updating FCM token on existing {role} row (re-activating)")
-                UserService.update_user(phone, role, {
-                    'fcmToken': fcm_token,
-                    'fcmTokenUpdatedAt': now_ist_iso(),
-                    'isActive': True,
-                })
+            # A fresh FCM token means the device just opened the app, so
+            # re-activate the row (logout sets isActive=False and nothing
+            # else flips it back on login — without this, any logged-out
+            # customer stays invisible to the custom broadcast handler).
+            # Missing rows are created by the same write.
+            created = UserService.upsert_fcm_token(phone, role, fcm_token, now_ist_iso())
+            if created:
+                logger.info(f"🆕 {role} row created with FCM token")
             else:
-                logger.info(f"🆕 {role} row not found, creating with FCM token")
-                new_user = User(
-                    phone=phone,
-                    name='',  # Will be updated during registration
-                    email='',
-                    role=role,
-                    is_active=True,
-                    fcm_token=fcm_token,
-                    fcm_token_updated_at=now_ist_iso()
-                )
-                UserService.create_user(new_user)
-                logger.info(f"✅ {role} row created with FCM token")
+                logger.info(f"✅ Updated FCM token on existing {role} row (re-activated)")
 
             metrics.add_metric(name="FCMTokenRegistered", unit="Count", value=1)
 
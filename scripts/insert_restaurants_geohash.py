@@ -14,7 +14,8 @@ By default, restaurants are spaced from 0.2 km up to 4 km from CENTER_LAT/CENTER
 Environment:
   HONESTEATS_API_URL — API base (do not include /api/v1). Trailing slash optional.
     Default: https://api.dev.yumdude.com (same as rork-honesteats lib/api-config DEV_BASE_URL)
-  REQUEST_DELAY_SEC   — delay between HTTP calls (default 0.05)
+  REQUEST_DELAY_SEC   — average spacing between HTTP calls across all workers, i.e. a
+    rate limit of 1/delay requests per second (default 0.05 → 20 req/s; 0 = unlimited)
   HONESTEATS_RETOOL_BYPASS — value for x-retool-header (matches app.py RETOOL_BYPASS_VALUE / Lambda env).
     Default: 9f2b7c4a6d1e8f30b5a9c2e7d4f1a6bc  Set empty to omit the header.
 """
@@ -26,11 +27,15 @@ import math
 import os
 import random
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # -----------------------------------------------------------------------------
 # Paths / defaults
@@ -76,6 +81,9 @@ NUM_CATEGORIES = 30
 # 30 * 7 = 210 ≥ 200
 ITEMS_PER_CATEGORY = 7
 
+# Menu POSTs in flight at once per restaurant (--concurrency).
+DEFAULT_CONCURRENCY = 8
+
 # -----------------------------------------------------------------------------
 # 30 menu categories (distinct per restaurant; reused names across restaurants)
 # -----------------------------------------------------------------------------
@@ -180,6 +188,38 @@ def pick_dish_images(rng: random.Random, restaurant_gallery: Sequence[str]) -> L
     return rng.sample(merged, k=want)
 
 
+def generate_coordinates_at_distances(
+    center_lat: float,
+    center_lng: float,
+    distances_km: Sequence[float],
+    bearings_degrees: Sequence[float],
+) -> List[Tuple[float, float]]:
+    """Return [(lat, lng), ...], one per (distance_km, bearing) pair from center.
+
+    The center's trig is computed once for the whole batch, and each
+    distance's once per point.
+    """
+    r_earth = 6371.0
+    lat1 = math.radians(center_lat)
+    lon1 = math.radians(center_lng)
+    sin_lat1 = math.sin(lat1)
+    cos_lat1 = math.cos(lat1)
+
+    coords: List[Tuple[float, float]] = []
+    for distance_km, bearing_degrees in zip(distances_km, bearings_degrees):
+        bearing = math.radians(bearing_degrees)
+        angular = distance_km / r_earth
+        sin_d = math.sin(angular)
+        cos_d = math.cos(angular)
+        lat2 = math.asin(sin_lat1 * cos_d + cos_lat1 * sin_d * math.cos(bearing))
+        lon2 = lon1 + math.atan2(
+            math.sin(bearing) * sin_d * cos_lat1,
+            cos_d - sin_lat1 * math.sin(lat2),
+        )
+        coords.append((math.degrees(lat2), math.degrees(lon2)))
+    return coords
+
+
 def generate_coordinate_at_distance(
     center_lat: float,
     center_lng: float,
@@ -187,20 +227,9 @@ def generate_coordinate_at_distance(
     bearing_degrees: float,
 ) -> Tuple[float, float]:
     """Return (lat, lng) at distance_km and bearing from center."""
-    r_earth = 6371.0
-    bearing = math.radians(bearing_degrees)
-    lat1 = math.radians(center_lat)
-    lon1 = math.radians(center_lng)
-
-    lat2 = math.asin(
-        math.sin(lat1) * math.cos(distance_km / r_earth)
-        + math.cos(lat1) * math.sin(distance_km / r_earth) * math.cos(bearing)
-    )
-    lon2 = lon1 + math.atan2(
-        math.sin(bearing) * math.sin(distance_km / r_earth) * math.cos(lat1),
-        math.cos(distance_km / r_earth) - math.sin(lat1) * math.sin(lat2),
-    )
-    return math.degrees(lat2), math.degrees(lon2)
+    return generate_coordinates_at_distances(
+        center_lat, center_lng, [distance_km], [bearing_degrees]
+    )[0]
 
 
 def _pick_veg_for_category(category: str) -> bool:
@@ -286,6 +315,33 @@ def distance_schedule(
     return [lo + (hi - lo) * (i / (n - 1)) for i in range(n)]
 
 
+class TokenBucket:
+    """Thread-safe token bucket: wait() blocks only when calls outpace `rate` per second.
+
+    Holds up to `capacity` tokens (default: one second's worth), so idle time
+    between bursts isn't wasted the way a fixed sleep per call is.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            # Take the token now (possibly going negative) and sleep off the
+            # debt outside the lock, so waiters queue up in order.
+            self._tokens -= 1.0
+            shortfall = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if shortfall > 0:
+            time.sleep(shortfall)
+
+
 class ApiClient:
     def __init__(
         self,
@@ -294,19 +350,42 @@ class ApiClient:
         session: Optional[requests.Session] = None,
         *,
         retool_bypass: Optional[str] = None,
+        pool_size: int = DEFAULT_CONCURRENCY,
     ):
         self.base_url = _normalize_api_base(base_url)
         self.delay_sec = delay_sec
-        self.session = session or requests.Session()
+        self._limiter = TokenBucket(1.0 / delay_sec) if delay_sec > 0 else None
+        if session is None:
+            session = requests.Session()
+            # Keep-alive pool big enough for every concurrent POST, so no
+            # request waits on (or discards) a connection. Only throttling
+            # and connect failures are retried: a POST that reached the API
+            # may already have created its row.
+            adapter = HTTPAdapter(
+                pool_connections=pool_size,
+                pool_maxsize=pool_size,
+                max_retries=Retry(
+                    total=3,
+                    connect=3,
+                    read=0,
+                    status=3,
+                    backoff_factor=0.2,
+                    status_forcelist=(429,),
+                    allowed_methods=frozenset({"POST"}),
+                ),
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
         headers: Dict[str, str] = {"Content-Type": "application/json"}
         bypass = DEFAULT_RETOOL_BYPASS if retool_bypass is None else retool_bypass
         if bypass:
             headers[RETOOL_BYPASS_HEADER] = bypass
         self.session.headers.update(headers)
 
-    def _sleep(self) -> None:
-        if self.delay_sec > 0:
-            time.sleep(self.delay_sec)
+    def _throttle(self) -> None:
+        if self._limiter is not None:
+            self._limiter.wait()
 
     def create_restaurant(
         self,
@@ -332,7 +411,7 @@ class ApiClient:
             "ownerId": owner_id,
             "restaurantImage": imgs[0] if len(imgs) == 1 else imgs,
         }
-        self._sleep()
+        self._throttle()
         url = f"{self.base_url}/api/v1/restaurants"
         r = self.session.post(url, json=payload, timeout=30)
         if r.status_code == 201:
@@ -341,10 +420,20 @@ class ApiClient:
         print(f"   ↳ POST {url}")
         return None
 
-    def create_menu_item(self, restaurant_id: str, body: Dict[str, Any]) -> bool:
-        self._sleep()
+    def create_menu_item(
+        self,
+        restaurant_id: str,
+        body: Dict[str, Any],
+        encoded: Optional[bytes] = None,
+    ) -> bool:
+        """POST one menu item; pass `encoded` (body already JSON-encoded) to skip re-encoding."""
+        self._throttle()
         url = f"{self.base_url}/api/v1/restaurants/{restaurant_id}/menu"
-        r = self.session.post(url, json=body, timeout=30)
+        if encoded is None:
+            r = self.session.post(url, json=body, timeout=30)
+        else:
+            # Session headers already carry Content-Type: application/json
+            r = self.session.post(url, data=encoded, timeout=30)
         if r.status_code == 201:
             return True
         print(f"      ✗ {body.get('name')} — {r.status_code} {r.text[:200]}")
@@ -362,13 +451,19 @@ def run(
     log_path: Optional[str],
     radius_km: float = RADIUS_KM,
     min_distance_km: float = MIN_SEED_DISTANCE_KM,
+    concurrency: int = DEFAULT_CONCURRENCY,
 ) -> None:
     distances = distance_schedule(
         num_restaurants,
         max_radius_km=radius_km,
         min_distance_km=min_distance_km,
     )
-    client = ApiClient(api_url, delay_sec)
+    # Precompute every seed's placement up front (padding distances like the
+    # loop below did) so the center trig is shared across all of them.
+    distances = [distances[i] if i < len(distances) else distances[-1] for i in range(num_restaurants)]
+    bearings = [random.uniform(0, 360) for _ in range(num_restaurants)]
+    coordinates = generate_coordinates_at_distances(CENTER_LAT, CENTER_LNG, distances, bearings)
+    client = ApiClient(api_url, delay_sec, pool_size=concurrency)
     created: List[Dict[str, Any]] = []
     menu_failures = 0
 
@@ -380,15 +475,16 @@ def run(
         f"Placement: {min_distance_km:.2f}–{radius_km:.2f} km from center (radius cap {radius_km:g} km)"
     )
     print(f"Restaurants: {num_restaurants} | Categories each: {NUM_CATEGORIES} | Items each: {NUM_CATEGORIES * ITEMS_PER_CATEGORY}")
+    print(f"Menu POST concurrency: {concurrency}")
     if DEFAULT_RETOOL_BYPASS:
         print(f"Auth bypass: {RETOOL_BYPASS_HEADER} present (len={len(DEFAULT_RETOOL_BYPASS)})")
     print("=" * 72)
 
     for i in range(num_restaurants):
         tpl = RESTAURANT_ARCHETYPES[i % len(RESTAURANT_ARCHETYPES)]
-        dist = distances[i] if i < len(distances) else distances[-1]
-        bearing = random.uniform(0, 360)
-        lat, lng = generate_coordinate_at_distance(CENTER_LAT, CENTER_LNG, dist, bearing)
+        dist = distances[i]
+        bearing = bearings[i]
+        lat, lng = coordinates[i]
         name = f"{tpl.name} #{i + 1}"
         owner_id = f"OWNER{1000 + i}"
         rating = round(random.uniform(3.7, 4.95), 2)
@@ -403,6 +499,9 @@ def run(
         if dry_run:
             continue
 
+        # Encode the whole menu up front, off the worker threads' POST path.
+        menu_bodies = [json.dumps(item, separators=(",", ":")).encode("utf-8") for item in menu_items]
+
         resp = client.create_restaurant(
             location_id=location_id,
             name=name,
@@ -420,14 +519,22 @@ def run(
         gh = resp.get("geohash", "N/A")
         print(f"   ✅ restaurantId={rid} geohash={gh}")
 
+        # Menu items are independent; overlap their round trips. map() keeps
+        # results in submission order so progress still counts up.
         ok = 0
-        for j, item in enumerate(menu_items):
-            if client.create_menu_item(rid, item):
-                ok += 1
-            else:
-                menu_failures += 1
-            if (j + 1) % 50 == 0:
-                print(f"      … {j + 1}/{len(menu_items)} items")
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = pool.map(
+                lambda item, encoded: client.create_menu_item(rid, item, encoded),
+                menu_items,
+                menu_bodies,
+            )
+            for j, success in enumerate(results):
+                if success:
+                    ok += 1
+                else:
+                    menu_failures += 1
+                if (j + 1) % 50 == 0:
+                    print(f"      … {j + 1}/{len(menu_items)} items")
 
         print(f"   ✅ Menu items created: {ok}/{len(menu_items)}")
         created.append({"restaurantId": rid, "name": name, "items_ok": ok, "geohash": gh})
@@ -456,7 +563,13 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
         "--delay",
         type=float,
         default=float(os.environ.get("REQUEST_DELAY_SEC", "0.05")),
-        help="Seconds between HTTP calls",
+        help="Average seconds between HTTP calls (rate limit = 1/delay req/s; 0 = unlimited)",
+    )
+    p.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Menu item POSTs in flight per restaurant (default: {DEFAULT_CONCURRENCY})",
     )
     p.add_argument("--dry-run", action="store_true", help="Print plan only; no HTTP")
     p.add_argument("--log-jsonl", default="", help="Append-only JSONL path for created restaurant IDs")
@@ -488,6 +601,7 @@ def main() -> None:
         log_path=args.log_jsonl or None,
         radius_km=radius_km,
         min_distance_km=min_distance_km,
+        concurrency=max(1, args.concurrency),
     )
 
 
@@ -4,17 +4,95 @@ Migration script to add role as Sort Key to UsersTable
 Converts from PK-only (phone) to composite key (phone, role)
 """
 import boto3
+import itertools
 import json
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Configuration
 ENVIRONMENT = 'dev'  # Change to 'prod' when ready
 TABLE_NAME = f'food-delivery-users-{ENVIRONMENT}'
-BACKUP_FILE = f'users_backup_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
+# One DynamoDB item (wire format) per line, written as the scan pages arrive
+BACKUP_FILE = f'users_backup_{datetime.now().strftime("%Y%m%d_%H%M%S")}.ndjson'
 
 dynamodb_client = boto3.client('dynamodb')
 
+# BatchWriteItem takes at most 25 requests; batches are sent BATCH_WORKERS at
+# a time (the boto3 client is thread-safe and pools 10 connections).
+BATCH_WRITE_SIZE = 25
+BATCH_WORKERS = 8
+# The backup scan is split into this many segments, scanned in parallel.
+BACKUP_SCAN_SEGMENTS = 8
+# Backed-up items looked up by their new key in verify_migration (BatchGetItem max 100).
+VERIFY_SAMPLE_SIZE = 25
+
+
+def _chunked(iterable, n=BATCH_WRITE_SIZE):
+    it = iter(iterable)
+    while chunk := list(itertools.islice(it, n)):
+        yield chunk
+
+
+def _batch_write(write_requests):
+    """Send one batch, retrying UnprocessedItems with exponential backoff."""
+    pending = {TABLE_NAME: write_requests}
+    delay = 0.05
+    while pending:
+        response = dynamodb_client.batch_write_item(RequestItems=pending)
+        pending = response.get('UnprocessedItems') or {}
+        if pending:
+            time.sleep(delay)
+            delay = min(delay * 2, 5.0)
+    return len(write_requests)
+
+
+def _run_batches(write_requests, total, verb):
+    """Write all requests in concurrent batches, printing progress as they land."""
+    done = 0
+    with ThreadPoolExecutor(max_workers=BATCH_WORKERS) as pool:
+        for count in pool.map(_batch_write, _chunked(write_requests)):
+            done += count
+            print(f"  {verb} {done}/{total} items...")
+
+
+def _read_backup():
+    """Stream the backed-up items back from BACKUP_FILE."""
+    with open(BACKUP_FILE) as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def _read_backup_keyed():
+    """Yield (phone, role, item) for each backed-up item, extracting the keys once.
+
+    Items without a role are users created before roles existed; they are
+    CUSTOMERs, and the role is filled in so the item can be put back under
+    the composite key.
+    """
+    for item in _read_backup():
+        role = item.setdefault('role', {'S': 'CUSTOMER'})['S']
+        yield item['phone']['S'], role, item
+
+
+def _scan_segment(segment, out, lock):
+    """Append one parallel-scan segment's items to out, a page at a time."""
+    count = 0
+    pages = dynamodb_client.get_paginator('scan').paginate(
+        TableName=TABLE_NAME,
+        Segment=segment,
+        TotalSegments=BACKUP_SCAN_SEGMENTS
+    )
+    for page in pages:
+        items = page.get('Items', [])
+        lines = ''.join(json.dumps(item, separators=(',', ':')) + '\n' for item in items)
+        with lock:
+            out.write(lines)
+        count += len(items)
+    return count
+
 
 def backup_existing_data():
     """Backup existing users table data"""
@@ -23,82 +101,60 @@ def backup_existing_data():
     print(f"{'='*60}")
     
     try:
-        items = []
-        last_evaluated_key = None
-        
-        while True:
-            if last_evaluated_key:
-                response = dynamodb_client.scan(
-                    TableName=TABLE_NAME,
-                    ExclusiveStartKey=last_evaluated_key
-                )
-            else:
-                response = dynamodb_client.scan(TableName=TABLE_NAME)
-            
-            items.extend(response.get('Items', []))
-            
-            last_evaluated_key = response.get('LastEvaluatedKey')
-            if not last_evaluated_key:
-                break
-        
-        # Save to file
-        with open(BACKUP_FILE, 'w') as f:
-            json.dump(items, f, indent=2)
+        lock = threading.Lock()
+        with open(BACKUP_FILE, 'w', buffering=1 << 20) as f:
+            with ThreadPoolExecutor(max_workers=BACKUP_SCAN_SEGMENTS) as pool:
+                count = sum(pool.map(
+                    lambda segment: _scan_segment(segment, f, lock),
+                    range(BACKUP_SCAN_SEGMENTS)
+                ))
         
-        print(f"✅ Backed up {len(items)} items to {BACKUP_FILE}")
-        return items
+        print(f"✅ Backed up {count} items to {BACKUP_FILE}")
+        return count
     except Exception as e:
         print(f"❌ Backup failed: {e}")
         sys.exit(1)
 
 
-def delete_old_items(items):
+def delete_old_items(count):
     """Delete old items (with phone-only key)"""
     print(f"\n{'='*60}")
     print("STEP 2: Deleting old items")
     print(f"{'='*60}")
     
     try:
-        for i, item in enumerate(items):
-            phone = item.get('phone', {}).get('S', '')
-            
-            # Delete old item (phone-only key)
-            dynamodb_client.delete_item(
-                TableName=TABLE_NAME,
-                Key={'phone': {'S': phone}}
-            )
-            
-            if (i + 1) % 10 == 0:
-                print(f"  Deleted {i + 1}/{len(items)} items...")
+        # Delete old items (phone-only key)
+        _run_batches(
+            (
+                {'DeleteRequest': {'Key': {'phone': {'S': phone}}}}
+                for phone, _, _ in _read_backup_keyed()
+            ),
+            count,
+            'Deleted'
+        )
         
-        print(f"✅ Deleted {len(items)} old items")
+        print(f"✅ Deleted {count} old items")
     except Exception as e:
         print(f"❌ Deletion failed: {e}")
         print("⚠️ You may need to manually delete remaining items")
         sys.exit(1)
 
 
-def create_new_items(items):
+def create_new_items(count):
     """Create new items with composite key (phone, role)"""
     print(f"\n{'='*60}")
     print("STEP 3: Creating new items with composite key")
     print(f"{'='*60}")
     
     try:
-        for i, item in enumerate(items):
-            phone = item.get('phone', {}).get('S', '')
-            role = item.get('role', {}).get('S', 'CUSTOMER')  # Default to CUSTOMER
-            
-            # Item already has 'role' attribute, just put it back
-            dynamodb_client.put_item(
-                TableName=TABLE_NAME,
-                Item=item
-            )
-            
-            if (i + 1) % 10 == 0:
-                print(f"  Created {i + 1}/{len(items)} items...")
+        # Item carries its (phone, role) key attributes, just put it back
+        _run_batches(
+            ({'PutRequest': {'Item': item}} for _, _, item in _read_backup_keyed()),
+            count,
+            'Created'
+        )
         
-        print(f"✅ Created {len(items)} items with composite key (phone, role)")
+        print(f"✅ Created {count} items with composite key (phone, role)")
     except Exception as e:
         print(f"❌ Creation failed: {e}")
         print(f"⚠️ Restore from backup: {BACKUP_FILE}")
@@ -112,30 +168,33 @@ def verify_migration(original_count):
     print(f"{'='*60}")
     
     try:
-        response = dynamodb_client.scan(
-            TableName=TABLE_NAME,
-            Select='COUNT'
-        )
-        
-        new_count = response.get('Count', 0)
-        
+        # Every batch above was retried until DynamoDB accepted all of it, so
+        # the count here is informational. ItemCount is refreshed by DynamoDB
+        # roughly every six hours and will usually still show the
+        # pre-migration figure right after the run.
+        table = dynamodb_client.describe_table(TableName=TABLE_NAME)['Table']
         print(f"  Original items: {original_count}")
-        print(f"  New items: {new_count}")
-        
-        if new_count == original_count:
-            print(f"✅ Migration successful - item count matches")
-        else:
-            print(f"⚠️ Warning: Item count mismatch!")
-            print(f"   Expected: {original_count}, Got: {new_count}")
+        print(f"  Table ItemCount (approximate, may lag): {table.get('ItemCount', 'N/A')}")
+        print(f"  Key schema: {[(k['AttributeName'], k['KeyType']) for k in table['KeySchema']]}")
         
-        # Sample a few items to verify composite key
-        sample = dynamodb_client.scan(TableName=TABLE_NAME, Limit=3)
+        # Probe a sample of backed-up items under the new (phone, role) key
+        sample = itertools.islice(_read_backup_keyed(), VERIFY_SAMPLE_SIZE)
+        keys = [{'phone': {'S': phone}, 'role': {'S': role}} for phone, role, _ in sample]
+        found = []
+        if keys:
+            response = dynamodb_client.batch_get_item(
+                RequestItems={TABLE_NAME: {'Keys': keys, 'ProjectionExpression': 'phone, #r',
+                                           'ExpressionAttributeNames': {'#r': 'role'}}}
+            )
+            found = response.get('Responses', {}).get(TABLE_NAME, [])
         
-        print(f"\n  Sample items:")
-        for item in sample.get('Items', []):
+        print(f"\n  Sample items found by (phone, role): {len(found)}/{len(keys)}")
+        for item in found[:3]:
             phone = item.get('phone', {}).get('S', 'N/A')
             role = item.get('role', {}).get('S', 'N/A')
             print(f"    - Phone: {phone}, Role: {role}")
+        if len(found) != len(keys):
+            print(f"⚠️ Warning: some sampled items are missing (or throttled); re-check before deploying")
         
         print(f"\n✅ Migration verification complete")
         
@@ -163,14 +222,13 @@ def main():
         sys.exit(0)
     
     # Step 1: Backup
-    items = backup_existing_data()
-    original_count = len(items)
+    original_count = backup_existing_data()
     
     # Step 2: Delete old items
-    delete_old_items(items)
+    delete_old_items(original_count)
     
     # Step 3: Create new items with composite key
-    create_new_items(items)
+    create_new_items(original_count)
     
     # Step 4: Verify
     verify_migration(original_count)
@@ -10,8 +10,9 @@ from datetime import datetime
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.geohash import encode as geohash_encode
+from utils.geohash import encode_prefixes as geohash_prefixes
 from utils.dynamodb import dynamodb_client
+from utils.dynamodb_helpers import coordinate_to_dynamodb
 
 # Configuration
 ENVIRONMENT = 'dev'
@@ -22,6 +23,21 @@ TEST_RIDER_ID = 'RDR_TEST_001'
 TEST_PHONE = '+919999999999'
 TEST_LAT = 12.9716
 TEST_LNG = 77.5946
+# Encoded once; GSI3 partitions on the 2-char prefix.
+TEST_GEOHASH_P7, TEST_GEOHASH_P2 = geohash_prefixes(TEST_LAT, TEST_LNG, (7, 2))
+
+# Location and GSI3 attributes set when the test rider goes online. The test
+# point is fixed, so these are built once; GSI3 is the riders table's only
+# spatial index.
+_GO_ONLINE_LOCATION = {
+    'lat': {'N': coordinate_to_dynamodb(TEST_LAT)},
+    'lng': {'N': coordinate_to_dynamodb(TEST_LNG)},
+    'geohash': {'S': TEST_GEOHASH_P7},
+    'GSI3PK': {'S': TEST_GEOHASH_P2},
+    'GSI3SK': {'S': f'RIDER#{TEST_RIDER_ID}'},
+}
+_GO_ONLINE_FIELDS = ('isActive', 'lastSeen', *_GO_ONLINE_LOCATION)
+_GO_ONLINE_UPDATE_EXPRESSION = 'SET ' + ', '.join(f'{f} = :{f}' for f in _GO_ONLINE_FIELDS)
 
 
 def create_test_rider():
@@ -50,12 +66,13 @@ def create_test_rider():
 
 
 def go_online_with_location():
-    """Simulate rider going online - should update GSI fields"""
+    """Simulate rider going online - should update GSI fields
+
+    Returns the rider item as written (UpdateItem ALL_NEW), or None on error.
+    """
     print(f"\n2️⃣ Simulating rider going ONLINE with location ({TEST_LAT}, {TEST_LNG})")
     
-    # Calculate geohash. GSI3 partitions on the 2-char prefix.
-    geohash_p7 = geohash_encode(TEST_LAT, TEST_LNG, precision=7)
-    geohash_p2 = geohash_p7[:2]
+    geohash_p7, geohash_p2 = TEST_GEOHASH_P7, TEST_GEOHASH_P2
 
     print(f"   📍 Geohash P7: {geohash_p7}")
     print(f"   📍 Geohash P2: {geohash_p2}")
@@ -63,46 +80,34 @@ def go_online_with_location():
     try:
         timestamp = datetime.utcnow().isoformat()
         
-        dynamodb_client.update_item(
+        response = dynamodb_client.update_item(
             TableName=RIDERS_TABLE,
             Key={'riderId': {'S': TEST_RIDER_ID}},
-            UpdateExpression='SET isActive = :active, lastSeen = :lastSeen, lat = :lat, lng = :lng, geohash = :geohash, GSI3PK = :gsi3pk, GSI3SK = :gsi3sk',
+            UpdateExpression=_GO_ONLINE_UPDATE_EXPRESSION,
             ExpressionAttributeValues={
-                ':active': {'BOOL': True},
+                ':isActive': {'BOOL': True},
                 ':lastSeen': {'S': timestamp},
-                ':lat': {'N': str(TEST_LAT)},
-                ':lng': {'N': str(TEST_LNG)},
-                ':geohash': {'S': geohash_p7},
-                ':gsi3pk': {'S': geohash_p2},
-                ':gsi3sk': {'S': f'RIDER#{TEST_RIDER_ID}'}
-            }
+                **{f':{f}': v for f, v in _GO_ONLINE_LOCATION.items()},
+            },
+            # The post-update image is what verify_gsi_fields checks, so no
+            # separate read-back is needed.
+            ReturnValues='ALL_NEW'
         )
         
         print(f"   ✅ Rider status updated to ONLINE")
         print(f"   ✅ GSI fields updated")
     except Exception as e:
         print(f"   ❌ Error: {e}")
-        return False
+        return None
     
-    return True
+    return response['Attributes']
 
 
-def verify_gsi_fields():
-    """Verify GSI fields were correctly set"""
+def verify_gsi_fields(item):
+    """Verify GSI fields were correctly set on the rider item returned by the update"""
     print(f"\n3️⃣ Verifying GSI fields in DynamoDB")
     
     try:
-        response = dynamodb_client.get_item(
-            TableName=RIDERS_TABLE,
-            Key={'riderId': {'S': TEST_RIDER_ID}}
-        )
-        
-        if 'Item' not in response:
-            print(f"   ❌ Rider not found")
-            return False
-        
-        item = response['Item']
-        
         # Check all required fields
         checks = {
             'isActive': item.get('isActive', {}).get('BOOL'),
@@ -132,7 +137,7 @@ def test_gsi_query():
     """Test querying by GSI3 (the only spatial GSI on the riders table)"""
     print(f"\n4️⃣ Testing GSI queries")
 
-    geohash_p2 = geohash_encode(TEST_LAT, TEST_LNG, precision=2)
+    geohash_p2 = TEST_GEOHASH_P2
     print(f"   Querying GSI3 for geohash: {geohash_p2}")
 
     try:
@@ -191,8 +196,9 @@ def main():
     # Run tests
     success = True
     success = success and create_test_rider()
-    success = success and go_online_with_location()
-    success = success and verify_gsi_fields()
+    rider_item = go_online_with_location() if success else None
+    success = success and rider_item is not None
+    success = success and verify_gsi_fields(rider_item)
     success = success and test_gsi_query()
     
     # Cleanup
@@ -14,6 +14,24 @@ API_BASE_URL = "https://htgicpllf2.execute-api.ap-south-1.amazonaws.com/default"
 API_KEY = "dev-mobile-key-12345"  # Replace with actual key
 TEST_PHONE = "9999999999"  # Test phone number
 
+# One keep-alive session for every call, so later requests reuse the
+# TCP/TLS connection opened by the first.
+SESSION = requests.Session()
+SESSION.headers.update({
+    "Content-Type": "application/json",
+    "X-Api-Key": API_KEY
+})
+
+# A small test image (1x1 pixel JPEG)
+TEST_IMAGE_BASE64 = "data:image/jpeg;base64,/9j/4AAQSkZJRgABAQEAYABgAAD/2wBDAAgGBgcGBQgHBwcJCQgKDBQNDAsLDBkSEw8UHRofHh0aHBwgJC4nICIsIxwcKDcpLDAxNDQ0Hyc5PTgyPC4zNDL/2wBDAQkJCQwLDBgNDRgyIRwhMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjL/wAARCAABAAEDASIAAhEBAxEB/8QAFQABAQAAAAAAAAAAAAAAAAAAAAv/xAAUEAEAAAAAAAAAAAAAAAAAAAAA/8QAFQEBAQAAAAAAAAAAAAAAAAAAAAX/xAAUEQEAAAAAAAAAAAAAAAAAAAAA/9oADAMBAAIRAxEAPwCwAA8A/9k="
+
+# Upload body shared by every document upload; only documentType varies.
+_UPLOAD_PAYLOAD_TEMPLATE = {
+    "phone": TEST_PHONE,
+    "imageBase64": TEST_IMAGE_BASE64
+}
+
+
 def test_upload_document(document_type):
     """Test: Upload document via backend"""
     print("\n" + "="*60)
@@ -22,25 +40,13 @@ def test_upload_document(document_type):
     
     url = f"{API_BASE_URL}/api/v1/riders/documents/upload"
     
-    # Create a small test image (1x1 pixel JPEG)
-    test_image_base64 = "data:image/jpeg;base64,/9j/4AAQSkZJRgABAQEAYABgAAD/2wBDAAgGBgcGBQgHBwcJCQgKDBQNDAsLDBkSEw8UHRofHh0aHBwgJC4nICIsIxwcKDcpLDAxNDQ0Hyc5PTgyPC4zNDL/2wBDAQkJCQwLDBgNDRgyIRwhMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjIyMjL/wAARCAABAAEDASIAAhEBAxEB/8QAFQABAQAAAAAAAAAAAAAAAAAAAAv/xAAUEAEAAAAAAAAAAAAAAAAAAAAA/8QAFQEBAQAAAAAAAAAAAAAAAAAAAAX/xAAUEQEAAAAAAAAAAAAAAAAAAAAA/9oADAMBAAIRAxEAPwCwAA8A/9k="
-    
-    payload = {
-        "phone": TEST_PHONE,
-        "documentType": document_type,
-        "imageBase64": test_image_base64
-    }
-    
-    headers = {
-        "Content-Type": "application/json",
-        "X-Api-Key": API_KEY
-    }
+    payload = {**_UPLOAD_PAYLOAD_TEMPLATE, "documentType": document_type}
     
     print(f"\nRequest URL: {url}")
     print(f"Document Type: {document_type}")
-    print(f"Image size: ~{len(test_image_base64)} chars (base64)")
+    print(f"Image size: ~{len(TEST_IMAGE_BASE64)} chars (base64)")
     
-    response = requests.post(url, json=payload, headers=headers)
+    response = SESSION.post(url, json=payload)
     
     print(f"\nResponse Status: {response.status_code}")
     print(f"Response: {json.dumps(response.json(), indent=2)}")
@@ -78,15 +84,10 @@ def test_signup(aadhar_url, pan_url):
         "panImageUrl": pan_url
     }
     
-    headers = {
-        "Content-Type": "application/json",
-        "X-Api-Key": API_KEY
-    }
-    
     print(f"\nRequest URL: {url}")
     print(f"Payload: {json.dumps(payload, indent=2)}")
     
-    response = requests.post(url, json=payload, headers=headers)
+    response = SESSION.post(url, json=payload)
     
     print(f"\nResponse Status: {response.status_code}")
     print(f"Response: {json.dumps(response.json(), indent=2)}")
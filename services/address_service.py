@@ -1,8 +1,34 @@
 """Address service"""
-from typing import List, Optional
+import json
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from aws_lambda_powertools import Logger
 from botocore.exceptions import ClientError
 from models.address import Address
 from utils.dynamodb import dynamodb_client, TABLES
+from utils.dynamodb_helpers import coordinate_to_dynamodb
+
+logger = Logger()
+
+_ADDRESSES_TABLE = TABLES['ADDRESSES']
+
+# BatchGetItem calls per chunk before batch_get_addresses gives up on keys
+# DynamoDB keeps returning as unprocessed (sustained throttling).
+BATCH_GET_MAX_ATTEMPTS = 5
+
+# Fields update_address accepts and how each is stored: 'S' attributes,
+# 'COORD' for lat/lng numbers, or 'JSON' for structured values kept as a
+# JSON string.
+_UPDATABLE_FIELDS = {
+    'label': 'S',
+    'address': 'S',
+    'lat': 'COORD',
+    'lng': 'COORD',
+    'geocodedAddress': 'S',
+    'formattedAddress': 'S',
+    'placeId': 'S',
+    'components': 'JSON',
+}
 
 
 class AddressService:
@@ -13,11 +39,12 @@ class AddressService:
         """Get address by phone and address ID"""
         try:
             response = dynamodb_client.get_item(
-                TableName=TABLES['ADDRESSES'],
+                TableName=_ADDRESSES_TABLE,
                 Key={
                     'phone': {'S': phone},
                     'addressId': {'S': address_id}
-                }
+                },
+                ConsistentRead=False
             )
             
             if 'Item' not in response:
@@ -27,12 +54,66 @@ class AddressService:
         except ClientError as e:
             raise Exception(f"Failed to get address: {str(e)}")
     
+    @staticmethod
+    def batch_get_addresses(keys: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], Address]:
+        """Fetch many addresses with BatchGetItem.
+
+        Args:
+            keys: (phone, address_id) pairs; duplicates are collapsed.
+
+        Returns:
+            {(phone, address_id): Address} for every key that exists. Keys
+            still unprocessed after BATCH_GET_MAX_ATTEMPTS are logged and
+            left out.
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        result = {}
+        try:
+            for i in range(0, len(unique_keys), 100):
+                chunk = unique_keys[i:i + 100]
+                pending = {
+                    _ADDRESSES_TABLE: {
+                        'Keys': [
+                            {'phone': {'S': phone}, 'addressId': {'S': address_id}}
+                            for phone, address_id in chunk
+                        ]
+                    }
+                }
+
+                delay = 0.1  # initial backoff seconds
+                for attempt in range(BATCH_GET_MAX_ATTEMPTS):
+                    response = dynamodb_client.batch_get_item(RequestItems=pending)
+
+                    for item in response.get('Responses', {}).get(_ADDRESSES_TABLE, []):
+                        address = Address.from_dynamodb_item(item)
+                        result[(address.phone, address.address_id)] = address
+
+                    pending = response.get('UnprocessedKeys') or {}
+                    if not pending:
+                        break
+                    if attempt < BATCH_GET_MAX_ATTEMPTS - 1:
+                        time.sleep(delay)
+                        delay = min(delay * 2, 5)
+                else:
+                    unprocessed = [
+                        (key['phone']['S'], key['addressId']['S'])
+                        for key in pending[_ADDRESSES_TABLE]['Keys']
+                    ]
+                    logger.warning(
+                        f"batch_get_addresses: {len(unprocessed)} keys still unprocessed after "
+                        f"{BATCH_GET_MAX_ATTEMPTS} attempts: {unprocessed}"
+                    )
+
+            return result
+        except ClientError as e:
+            raise Exception(f"Failed to batch get addresses: {str(e)}")
+
     @staticmethod
     def create_address(address: Address) -> Address:
         """Create a new address"""
         try:
             dynamodb_client.put_item(
-                TableName=TABLES['ADDRESSES'],
+                TableName=_ADDRESSES_TABLE,
                 Item=address.to_dynamodb_item()
             )
             return address
@@ -44,11 +125,12 @@ class AddressService:
         """List all addresses for a customer"""
         try:
             response = dynamodb_client.query(
-                TableName=TABLES['ADDRESSES'],
+                TableName=_ADDRESSES_TABLE,
                 KeyConditionExpression='phone = :phone',
                 ExpressionAttributeValues={
                     ':phone': {'S': phone}
-                }
+                },
+                ConsistentRead=False
             )
             
             addresses = []
@@ -64,7 +146,7 @@ class AddressService:
         """Delete all addresses for a customer"""
         try:
             response = dynamodb_client.query(
-                TableName=TABLES['ADDRESSES'],
+                TableName=_ADDRESSES_TABLE,
                 KeyConditionExpression='phone = :phone',
                 ExpressionAttributeValues={
                     ':phone': {'S': phone}
@@ -76,7 +158,7 @@ class AddressService:
                 if not address_id:
                     continue
                 dynamodb_client.delete_item(
-                    TableName=TABLES['ADDRESSES'],
+                    TableName=_ADDRESSES_TABLE,
                     Key={
                         'phone': {'S': phone},
                         'addressId': {'S': address_id}
@@ -88,67 +170,43 @@ class AddressService:
     @staticmethod
     def update_address(phone: str, address_id: str, updates: dict) -> Address:
         """Update address"""
+        if not updates:
+            return AddressService.get_address(phone, address_id)
         try:
             update_expressions = []
             expression_attribute_names = {}
             expression_attribute_values = {}
             
-            if 'label' in updates:
-                update_expressions.append('#label = :label')
-                expression_attribute_names['#label'] = 'label'
-                expression_attribute_values[':label'] = {'S': updates['label']}
-            
-            if 'address' in updates:
-                update_expressions.append('#address = :address')
-                expression_attribute_names['#address'] = 'address'
-                expression_attribute_values[':address'] = {'S': updates['address']}
-            
-            if 'lat' in updates:
-                update_expressions.append('#lat = :lat')
-                expression_attribute_names['#lat'] = 'lat'
-                expression_attribute_values[':lat'] = {'N': str(updates['lat'])}
-            
-            if 'lng' in updates:
-                update_expressions.append('#lng = :lng')
-                expression_attribute_names['#lng'] = 'lng'
-                expression_attribute_values[':lng'] = {'N': str(updates['lng'])}
-            
-            if 'geocodedAddress' in updates:
-                update_expressions.append('#geocodedAddress = :geocodedAddress')
-                expression_attribute_names['#geocodedAddress'] = 'geocodedAddress'
-                expression_attribute_values[':geocodedAddress'] = {'S': updates['geocodedAddress']}
-            
-            if 'formattedAddress' in updates:
-                update_expressions.append('#formattedAddress = :formattedAddress')
-                expression_attribute_names['#formattedAddress'] = 'formattedAddress'
-                expression_attribute_values[':formattedAddress'] = {'S': updates['formattedAddress']}
-            
-            if 'placeId' in updates:
-                update_expressions.append('#placeId = :placeId')
-                expression_attribute_names['#placeId'] = 'placeId'
-                expression_attribute_values[':placeId'] = {'S': updates['placeId']}
-            
-            if 'components' in updates:
-                import json
-                update_expressions.append('#components = :components')
-                expression_attribute_names['#components'] = 'components'
-                expression_attribute_values[':components'] = {'S': json.dumps(updates['components'])}
+            for field, value in updates.items():
+                attr_type = _UPDATABLE_FIELDS.get(field)
+                if attr_type is None:
+                    continue
+                if attr_type == 'COORD':
+                    attr_value = {'N': coordinate_to_dynamodb(value)}
+                elif attr_type == 'JSON':
+                    attr_value = {'S': json.dumps(value)}
+                else:
+                    attr_value = {'S': value}
+                update_expressions.append(f'#{field} = :{field}')
+                expression_attribute_names[f'#{field}'] = field
+                expression_attribute_values[f':{field}'] = attr_value
             
             if not update_expressions:
                 return AddressService.get_address(phone, address_id)
             
-            dynamodb_client.update_item(
-                TableName=TABLES['ADDRESSES'],
+            response = dynamodb_client.update_item(
+                TableName=_ADDRESSES_TABLE,
                 Key={
                     'phone': {'S': phone},
                     'addressId': {'S': address_id}
                 },
                 UpdateExpression=f"SET {', '.join(update_expressions)}",
                 ExpressionAttributeNames=expression_attribute_names,
-                ExpressionAttributeValues=expression_attribute_values
+                ExpressionAttributeValues=expression_attribute_values,
+                ReturnValues='ALL_NEW'
             )
             
-            return AddressService.get_address(phone, address_id)
+            return Address.from_dynamodb_item(response['Attributes'])
         except ClientError as e:
             raise Exception(f"Failed to update address: {str(e)}")
     
@@ -157,7 +215,7 @@ class AddressService:
         """Delete an address"""
         try:
             dynamodb_client.delete_item(
-                TableName=TABLES['ADDRESSES'],
+                TableName=_ADDRESSES_TABLE,
                 Key={
                     'phone': {'S': phone},
                     'addressId': {'S': address_id}
@@ -3,8 +3,10 @@ from typing import Dict, List, Optional
 from botocore.exceptions import ClientError
 from models.rider_earnings import RiderEarnings
 from utils.dynamodb import dynamodb_client, TABLES
+import concurrent.futures
+import time
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from aws_lambda_powertools import Logger
 from botocore.exceptions import ClientError
@@ -13,9 +15,33 @@ from models.rider_earnings import RiderEarnings
 from services.rider_config_service import fetch_rider_config
 from utils.datetime_ist import IST, now_ist_iso
 from utils.dynamodb import TABLES, dynamodb_client
+from utils.dynamodb_helpers import projection_kwargs
 
 logger = Logger()
 
+_EARNINGS_TABLE = TABLES["EARNINGS"]
+
+# DynamoDB per-call item limits for BatchWriteItem / TransactWriteItems.
+BATCH_WRITE_MAX_ITEMS = 25
+TRANSACT_WRITE_MAX_ITEMS = 100
+
+# Settlement chunks are written concurrently; the DynamoDB client pools 64
+# connections, so 16 in-flight transactions never wait on the HTTP pool.
+SETTLE_CONCURRENCY = 16
+_settle_executor = concurrent.futures.ThreadPoolExecutor(max_workers=SETTLE_CONCURRENCY)
+
+# Month-long ranges are read as one Query per day, this many at a time.
+DAY_QUERY_CONCURRENCY = 16
+_day_query_executor = concurrent.futures.ThreadPoolExecutor(max_workers=DAY_QUERY_CONCURRENCY)
+
+# Attributes summarize_earnings / _aggregate_totals (and the date-range sort) read.
+SUMMARY_ATTRIBUTES = (
+    'date', 'createdAt', 'totalDeliveries', 'totalEarnings', 'deliveryFees',
+    'tips', 'incentives', 'cashCollected', 'entryType',
+)
+# Attributes the settlement paths need to pick and key the rows to settle.
+SETTLE_ATTRIBUTES = ('date', 'orderId', 'entryType')
+
 
 def _parse_iso_datetime(value: Optional[str]) -> Optional[datetime]:
     if value is None:
@@ -55,6 +81,67 @@ def _is_cod_row(e: "RiderEarnings") -> bool:
     return (e.entry_type or "") == "COD_AMOUNT_COLLECTED"
 
 
+def _chunks(items: List[Any], size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _batch_put_earnings(items: List[dict]) -> None:
+    """Put earnings rows BATCH_WRITE_MAX_ITEMS at a time, retrying unprocessed ones."""
+    for chunk in _chunks(items, BATCH_WRITE_MAX_ITEMS):
+        pending = {_EARNINGS_TABLE: [{"PutRequest": {"Item": item}} for item in chunk]}
+        delay = 0.05
+        while pending:
+            response = dynamodb_client.batch_write_item(RequestItems=pending)
+            pending = response.get("UnprocessedItems") or {}
+            if pending:
+                time.sleep(delay)
+                delay = min(delay * 2, 1.0)
+
+
+def _mark_rows_settled(
+    rider_id: str, rows: List[RiderEarnings], settled_at: str, settlement_id: str
+) -> None:
+    """Flag earnings rows settled, up to TRANSACT_WRITE_MAX_ITEMS rows per round-trip.
+
+    BatchWriteItem can't express an update, so each chunk is a TransactWriteItems
+    of per-row Updates: the rows keep every other attribute untouched and a chunk
+    either settles completely or not at all.
+    """
+    values = {
+        ":settled": {"BOOL": True},
+        ":settledAt": {"S": settled_at},
+        ":settlementId": {"S": settlement_id},
+    }
+
+    def settle_chunk(chunk: List[RiderEarnings]) -> None:
+        dynamodb_client.transact_write_items(
+            TransactItems=[
+                {
+                    "Update": {
+                        "TableName": _EARNINGS_TABLE,
+                        "Key": {
+                            "riderId": {"S": rider_id},
+                            "date": {"S": earning.date},
+                        },
+                        "UpdateExpression": "SET settled = :settled, settledAt = :settledAt, settlementId = :settlementId",
+                        "ExpressionAttributeValues": values,
+                    }
+                }
+                for earning in chunk
+            ]
+        )
+
+    chunks = list(_chunks(rows, TRANSACT_WRITE_MAX_ITEMS))
+    if len(chunks) <= 1:
+        for chunk in chunks:
+            settle_chunk(chunk)
+        return
+    # Chunks are independent; .result() re-raises the first failure.
+    for future in [_settle_executor.submit(settle_chunk, chunk) for chunk in chunks]:
+        future.result()
+
+
 def _aggregate_totals(earnings_list: List[RiderEarnings]) -> Dict[str, float]:
     """Compute the period-level rollup values from a list of earnings rows.
 
@@ -296,11 +383,54 @@ class EarningsService:
             "dailyBreakdown": [e.to_dict() for e in earnings_list],
         }
 
+    @staticmethod
+    def _summarize_items(items: List[dict]) -> dict:
+        """``summarize_earnings`` overlaid with ``_aggregate_totals``, minus the breakdown.
+
+        Works on raw (SUMMARY_ATTRIBUTES-projected) items, summing in one pass
+        without building a RiderEarnings per row. As in the summaries, the
+        period totals from ``_aggregate_totals`` are left unrounded.
+        """
+        deliveries = 0
+        earnings = tips = incentives = cash = bonus = slot = delivery = 0.0
+        slot_entry_types = (
+            EarningsService.ENTRY_TYPE_SLOT_GUARANTEE,
+            EarningsService.ENTRY_TYPE_SLOT_PENALTY,
+        )
+        for item in items:
+            entry_type = item["entryType"]["S"] if "entryType" in item else ""
+            total = float(item.get("totalEarnings", {}).get("N", "0"))
+            deliveries += int(item.get("totalDeliveries", {}).get("N", "0"))
+            tips += float(item.get("tips", {}).get("N", "0"))
+            incentives += float(item.get("incentives", {}).get("N", "0"))
+            if "cashCollected" in item:
+                cash += float(item["cashCollected"]["N"])
+            if entry_type != EarningsService.ENTRY_TYPE_COD_AMOUNT_COLLECTED:
+                earnings += total
+            if entry_type == EarningsService.ENTRY_TYPE_MILESTONE_BONUS:
+                bonus += total
+            else:
+                delivery += float(item.get("deliveryFees", {}).get("N", "0"))
+            if entry_type in slot_entry_types:
+                slot += total
+        return {
+            "totalDeliveries": deliveries,
+            "totalEarnings": earnings,
+            "totalTips": tips,
+            "totalIncentives": incentives,
+            "totalBonusEarnings": round(bonus, 2),
+            "totalSlotEarnings": round(slot, 2),
+            "deliveryEarnings": round(delivery, 2),
+            "totalCashCollected": cash,
+        }
+
     @staticmethod
     def get_or_create_daily_earnings(rider_id: str, date: str) -> RiderEarnings:
         """Get aggregated earnings summary for a specific date."""
         try:
-            earnings_list = EarningsService.get_earnings_for_date_range(rider_id, date, date)
+            earnings_list = EarningsService.get_earnings_for_date_range(
+                rider_id, date, date, attributes=SUMMARY_ATTRIBUTES
+            )
             summary = EarningsService.summarize_earnings(earnings_list)
             return RiderEarnings(
                 rider_id=rider_id,
@@ -335,29 +465,67 @@ class EarningsService:
         duplicates across a UTC midnight boundary. Defaults to today UTC.
         """
         try:
-            date_str = date_override or datetime.utcnow().strftime('%Y-%m-%d')
-            earnings = RiderEarnings(
-                rider_id=rider_id,
-                date=f"{date_str}#{order_id}",
-                total_deliveries=1,
-                total_earnings=delivery_fee + tip + incentives,
-                delivery_fees=delivery_fee,
-                tips=tip,
-                incentives=incentives,
-                delivery_duration_minutes=delivery_duration_minutes,
-                order_id=order_id,
-                settled=False,
-                settled_at=None,
-                entry_type=EarningsService.ENTRY_TYPE_ORDER_EARNING,
+            earnings = EarningsService._delivery_earning(
+                rider_id, order_id, delivery_fee, tip, incentives,
+                delivery_duration_minutes, date_override,
             )
 
             dynamodb_client.put_item(
-                TableName=TABLES["EARNINGS"],
+                TableName=_EARNINGS_TABLE,
                 Item=earnings.to_dynamodb_item(),
             )
         except ClientError as e:
             raise Exception(f"Failed to add delivery: {str(e)}")
 
+    @staticmethod
+    def add_deliveries_bulk(deliveries: List[dict]) -> None:
+        """Add many deliveries, 25 rows per BatchWriteItem call.
+
+        Each entry holds ``add_delivery`` keyword arguments (``rider_id``,
+        ``order_id``, ``delivery_fee`` and optionally ``tip``, ``incentives``,
+        ``delivery_duration_minutes``, ``date_override``). Rows land exactly as
+        ``add_delivery`` would write them, so re-sending an order overwrites
+        its row rather than duplicating it. Order IDs must be unique per
+        rider and date within one call.
+        """
+        try:
+            # One clock read for the whole batch rather than one per row
+            today = datetime.utcnow().date().isoformat()
+            _batch_put_earnings([
+                EarningsService._delivery_earning(
+                    **{**delivery, "date_override": delivery.get("date_override") or today}
+                ).to_dynamodb_item()
+                for delivery in deliveries
+            ])
+        except ClientError as e:
+            raise Exception(f"Failed to add deliveries: {str(e)}")
+
+    @staticmethod
+    def _delivery_earning(
+        rider_id: str,
+        order_id: str,
+        delivery_fee: float,
+        tip: float = 0.0,
+        incentives: float = 0.0,
+        delivery_duration_minutes: int = 0,
+        date_override: Optional[str] = None,
+    ) -> RiderEarnings:
+        date_str = date_override or datetime.utcnow().strftime('%Y-%m-%d')
+        return RiderEarnings(
+            rider_id=rider_id,
+            date=f"{date_str}#{order_id}",
+            total_deliveries=1,
+            total_earnings=delivery_fee + tip + incentives,
+            delivery_fees=delivery_fee,
+            tips=tip,
+            incentives=incentives,
+            delivery_duration_minutes=delivery_duration_minutes,
+            order_id=order_id,
+            settled=False,
+            settled_at=None,
+            entry_type=EarningsService.ENTRY_TYPE_ORDER_EARNING,
+        )
+
     @staticmethod
     def add_milestone_bonus(
         rider_id: str,
@@ -396,7 +564,7 @@ class EarningsService:
         )
         try:
             dynamodb_client.put_item(
-                TableName=TABLES["EARNINGS"],
+                TableName=_EARNINGS_TABLE,
                 Item=earning.to_dynamodb_item(),
                 ConditionExpression="attribute_not_exists(#date)",
                 ExpressionAttributeNames={"#date": "date"},
@@ -437,7 +605,7 @@ class EarningsService:
         )
         try:
             dynamodb_client.put_item(
-                TableName=TABLES["EARNINGS"],
+                TableName=_EARNINGS_TABLE,
                 Item=earning.to_dynamodb_item(),
                 ConditionExpression="attribute_not_exists(#date)",
                 ExpressionAttributeNames={"#date": "date"},
@@ -469,7 +637,7 @@ class EarningsService:
         )
         try:
             dynamodb_client.put_item(
-                TableName=TABLES["EARNINGS"],
+                TableName=_EARNINGS_TABLE,
                 Item=earning.to_dynamodb_item(),
                 ConditionExpression="attribute_not_exists(#date)",
                 ExpressionAttributeNames={"#date": "date"},
@@ -564,87 +732,203 @@ class EarningsService:
             )
 
             dynamodb_client.put_item(
-                TableName=TABLES['EARNINGS'],
+                TableName=_EARNINGS_TABLE,
                 Item=earnings.to_dynamodb_item()
             )
         except ClientError as e:
             raise Exception(f"Failed to record cash collected: {str(e)}")
 
     @staticmethod
-    def get_earnings_for_date_range(rider_id: str, start_date: str, end_date: str) -> List[RiderEarnings]:
-        """Get earnings for a date range"""
+    def get_earnings_for_date_range(
+        rider_id: str,
+        start_date: str,
+        end_date: str,
+        attributes: Optional[Tuple[str, ...]] = None,
+    ) -> List[RiderEarnings]:
+        """Get earnings for a date range.
+
+        ``attributes`` limits the fetched attributes (e.g. SUMMARY_ATTRIBUTES);
+        omitted ones come back as model defaults, so only pass it when the
+        caller won't emit the rows themselves.
+        """
+        return EarningsService._hydrate_sorted(
+            EarningsService._query_earnings_items(rider_id, start_date, end_date, attributes)
+        )
+
+    @staticmethod
+    def _query_earnings_items(
+        rider_id: str,
+        start_date: str,
+        end_date: str,
+        attributes: Optional[Tuple[str, ...]] = None,
+    ) -> List[dict]:
+        """Raw earnings items (DynamoDB wire format) for a date range, in key order."""
         try:
-            response = dynamodb_client.query(
-                TableName=TABLES["EARNINGS"],
-                KeyConditionExpression="riderId = :riderId AND #date BETWEEN :start AND :end",
-                ExpressionAttributeNames={
-                    "#date": "date",
-                },
-                ExpressionAttributeValues={
-                    ":riderId": {"S": rider_id},
-                    ":start": {"S": f"{start_date}#"},
-                    ":end": {"S": f"{end_date}#\uffff"},
-                },
+            query_params = EarningsService._earnings_query_params(
+                rider_id, start_date, end_date, attributes
             )
+            # Follow LastEvaluatedKey: a busy rider's month can exceed one
+            # 1 MB page, and stopping at the first page undercounts silently.
+            items: List[dict] = []
+            while True:
+                response = dynamodb_client.query(**query_params)
+                items.extend(response.get("Items", []))
+                if "LastEvaluatedKey" not in response:
+                    break
+                query_params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+            return items
+        except ClientError as e:
+            raise Exception(f"Failed to get earnings: {str(e)}")
 
-            earnings_list = [
-                RiderEarnings.from_dynamodb_item(item)
-                for item in response.get("Items", [])
-            ]
-            earnings_list.sort(
-                key=lambda earning: (earning.date or "", earning.created_at or ""),
-                reverse=True,
+    @staticmethod
+    def _earnings_query_params(
+        rider_id: str,
+        start_date: str,
+        end_date: str,
+        attributes: Optional[Tuple[str, ...]] = None,
+    ) -> dict:
+        query_params = {
+            "TableName": _EARNINGS_TABLE,
+            "KeyConditionExpression": "riderId = :riderId AND #date BETWEEN :start AND :end",
+            "ExpressionAttributeNames": {
+                "#date": "date",
+            },
+            "ExpressionAttributeValues": {
+                ":riderId": {"S": rider_id},
+                ":start": {"S": f"{start_date}#"},
+                ":end": {"S": f"{end_date}#\uffff"},
+            },
+            # Summaries tolerate a just-written row showing up a moment
+            # late; eventually consistent reads cost half the RCUs.
+            "ConsistentRead": False,
+        }
+        if attributes:
+            projection = projection_kwargs(attributes)
+            query_params["ProjectionExpression"] = projection["ProjectionExpression"]
+            query_params["ExpressionAttributeNames"].update(projection["ExpressionAttributeNames"])
+        return query_params
+
+    @staticmethod
+    def _query_earnings_items_by_day(
+        rider_id: str,
+        start_date: str,
+        end_date: str,
+        attributes: Optional[Tuple[str, ...]] = None,
+    ) -> List[dict]:
+        """``_query_earnings_items`` that falls back to parallel per-day queries.
+
+        A normal month fits in one page of the range query, so that is read
+        first. Only when it comes back truncated are the remaining days read
+        one query per day, concurrently: every entry key starts with its day,
+        so each ``<day>#`` prefix pages independently instead of one range
+        query walking a month of pages in sequence.
+        """
+        # The key is needed to split the first page by day.
+        if attributes and "date" not in attributes:
+            attributes = ("date", *attributes)
+        try:
+            response = dynamodb_client.query(
+                **EarningsService._earnings_query_params(rider_id, start_date, end_date, attributes)
             )
-            return earnings_list
         except ClientError as e:
             raise Exception(f"Failed to get earnings: {str(e)}")
+        items: List[dict] = response.get("Items", [])
+        if "LastEvaluatedKey" not in response:
+            return items
+
+        # The page may stop partway through a day: keep the days before it
+        # and re-read that day onward.
+        resume_day = response["LastEvaluatedKey"]["date"]["S"].split("#", 1)[0]
+        items = [item for item in items if item["date"]["S"] < f"{resume_day}#"]
+        start = datetime.strptime(resume_day, "%Y-%m-%d").date()
+        end = datetime.strptime(end_date, "%Y-%m-%d").date()
+        days = [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+        futures = [
+            _day_query_executor.submit(
+                EarningsService._query_earnings_items, rider_id, day, day, attributes
+            )
+            for day in days
+        ]
+        for future in futures:
+            items.extend(future.result())
+        return items
+
+    @staticmethod
+    def _hydrate_sorted(items: List[dict]) -> List[RiderEarnings]:
+        earnings_list = [RiderEarnings.from_dynamodb_item(item) for item in items]
+        earnings_list.sort(
+            key=lambda earning: (earning.date or "", earning.created_at or ""),
+            reverse=True,
+        )
+        return earnings_list
+
+    @staticmethod
+    def get_earnings_by_day(
+        rider_id: str,
+        start_date: str,
+        end_date: str,
+        attributes: Optional[Tuple[str, ...]] = None,
+    ) -> List[RiderEarnings]:
+        """Same rows as ``get_earnings_for_date_range``, via ``_query_earnings_items_by_day``."""
+        return EarningsService._hydrate_sorted(
+            EarningsService._query_earnings_items_by_day(rider_id, start_date, end_date, attributes)
+        )
 
     @staticmethod
     def get_today_earnings(rider_id: str) -> RiderEarnings:
         """Get today's earnings."""
-        today = datetime.utcnow().strftime("%Y-%m-%d")
+        today = datetime.utcnow().date().isoformat()
         return EarningsService.get_or_create_daily_earnings(rider_id, today)
 
     @staticmethod
-    def get_weekly_earnings(rider_id: str) -> dict:
-        """Get this week's earnings summary."""
-        today = datetime.utcnow()
-        start_of_week = today - timedelta(days=today.weekday())
+    def get_weekly_earnings(rider_id: str, include_breakdown: bool = True) -> dict:
+        """Get this week's earnings summary.
 
-        start_date = start_of_week.strftime("%Y-%m-%d")
-        end_date = today.strftime("%Y-%m-%d")
+        With ``include_breakdown=False`` only the totals are returned, summed
+        straight from SUMMARY_ATTRIBUTES-projected items.
+        """
+        today = datetime.utcnow().date()
+        start_date = (today - timedelta(days=today.weekday())).isoformat()
+        end_date = today.isoformat()
+
+        period = {"period": "week", "startDate": start_date, "endDate": end_date}
+        if not include_breakdown:
+            items = EarningsService._query_earnings_items(
+                rider_id, start_date, end_date, SUMMARY_ATTRIBUTES
+            )
+            return {**period, **EarningsService._summarize_items(items)}
 
         earnings_list = EarningsService.get_earnings_for_date_range(rider_id, start_date, end_date)
-        totals = _aggregate_totals(earnings_list)
-
         return {
-            "period": "week",
-            "startDate": start_date,
-            "endDate": end_date,
+            **period,
             **EarningsService.summarize_earnings(earnings_list),
-            **totals,
-            "dailyBreakdown": [e.to_dict() for e in earnings_list]
+            **_aggregate_totals(earnings_list),
         }
 
     @staticmethod
-    def get_monthly_earnings(rider_id: str) -> dict:
-        """Get this month's earnings summary."""
-        today = datetime.utcnow()
-        start_of_month = today.replace(day=1)
+    def get_monthly_earnings(rider_id: str, include_breakdown: bool = True) -> dict:
+        """Get this month's earnings summary.
 
-        start_date = start_of_month.strftime("%Y-%m-%d")
-        end_date = today.strftime("%Y-%m-%d")
-
-        earnings_list = EarningsService.get_earnings_for_date_range(rider_id, start_date, end_date)
-        totals = _aggregate_totals(earnings_list)
+        With ``include_breakdown=False`` only the totals are returned, summed
+        straight from SUMMARY_ATTRIBUTES-projected items.
+        """
+        today = datetime.utcnow().date()
+        end_date = today.isoformat()
+        # YYYY-MM-01, straight from the end date's year-month prefix
+        start_date = f"{end_date[:8]}01"
+
+        period = {"period": "month", "startDate": start_date, "endDate": end_date}
+        if not include_breakdown:
+            items = EarningsService._query_earnings_items_by_day(
+                rider_id, start_date, end_date, SUMMARY_ATTRIBUTES
+            )
+            return {**period, **EarningsService._summarize_items(items)}
 
+        earnings_list = EarningsService.get_earnings_by_day(rider_id, start_date, end_date)
         return {
-            "period": "month",
-            "startDate": start_date,
-            "endDate": end_date,
+            **period,
             **EarningsService.summarize_earnings(earnings_list),
-            **totals,
-            "dailyBreakdown": [e.to_dict() for e in earnings_list]
+            **_aggregate_totals(earnings_list),
         }
 
     @staticmethod
@@ -658,16 +942,17 @@ class EarningsService:
         """Mark earnings rows as settled for matching order IDs in date range."""
         try:
             earnings_list = EarningsService.get_earnings_for_date_range(
-                rider_id, start_date, end_date
+                rider_id, start_date, end_date, attributes=SETTLE_ATTRIBUTES
             )
 
             settled_at = datetime.utcnow().isoformat()
-            updated_order_ids: List[str] = []
+            to_settle: List[RiderEarnings] = []
+            order_id_set = set(order_ids)
 
             for earning in earnings_list:
                 if not earning.order_id:
                     continue
-                if earning.order_id not in order_ids:
+                if earning.order_id not in order_id_set:
                     continue
                 # COD rows are cash physically collected by the rider on behalf
                 # of the platform — they are not part of the rider's payout and
@@ -680,22 +965,10 @@ class EarningsService:
                     )
                     continue
 
-                dynamodb_client.update_item(
-                    TableName=TABLES["EARNINGS"],
-                    Key={
-                        "riderId": {"S": rider_id},
-                        "date": {"S": earning.date},
-                    },
-                    UpdateExpression="SET settled = :settled, settledAt = :settledAt, settlementId = :settlementId",
-                    ExpressionAttributeValues={
-                        ":settled": {"BOOL": True},
-                        ":settledAt": {"S": settled_at},
-                        ":settlementId": {"S": settlement_id},
-                    },
-                )
-                updated_order_ids.append(earning.order_id)
+                to_settle.append(earning)
 
-            return updated_order_ids
+            _mark_rows_settled(rider_id, to_settle, settled_at, settlement_id)
+            return [earning.order_id for earning in to_settle]
         except ClientError as e:
             raise Exception(f"Failed to settle earnings: {str(e)}")
 
@@ -710,35 +983,24 @@ class EarningsService:
         """Mark COD cash-collected rows as returned/settled for matching orders."""
         try:
             earnings_list = EarningsService.get_earnings_for_date_range(
-                rider_id, start_date, end_date
+                rider_id, start_date, end_date, attributes=SETTLE_ATTRIBUTES
             )
 
             settled_at = datetime.utcnow().isoformat()
-            updated_order_ids: List[str] = []
+            to_settle: List[RiderEarnings] = []
+            order_id_set = set(order_ids)
 
             for earning in earnings_list:
                 if not earning.order_id:
                     continue
-                if earning.order_id not in order_ids:
+                if earning.order_id not in order_id_set:
                     continue
                 if not _is_cod_row(earning):
                     continue
 
-                dynamodb_client.update_item(
-                    TableName=TABLES["EARNINGS"],
-                    Key={
-                        "riderId": {"S": rider_id},
-                        "date": {"S": earning.date},
-                    },
-                    UpdateExpression="SET settled = :settled, settledAt = :settledAt, settlementId = :settlementId",
-                    ExpressionAttributeValues={
-                        ":settled": {"BOOL": True},
-                        ":settledAt": {"S": settled_at},
-                        ":settlementId": {"S": settlement_id},
-                    },
-                )
-                updated_order_ids.append(earning.order_id)
+                to_settle.append(earning)
 
-            return updated_order_ids
+            _mark_rows_settled(rider_id, to_settle, settled_at, settlement_id)
+            return [earning.order_id for earning in to_settle]
         except ClientError as e:
             raise Exception(f"Failed to settle COD cash: {str(e)}")
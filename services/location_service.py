@@ -2,6 +2,7 @@
 import json
 import urllib.request
 import urllib.parse
+from collections import OrderedDict
 from typing import Optional, Dict, Any
 from datetime import datetime, timedelta
 from botocore.exceptions import ClientError
@@ -11,6 +12,31 @@ from utils.ssm import get_secret
 
 logger = Logger()
 
+# Per-container LRU in front of the DynamoDB cache: {cache key: location data}.
+# Repeat lookups for a coordinate (e.g. a rider pinging from one spot) are
+# served from memory instead of paying a GetItem round trip each time.
+_local_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+LOCAL_CACHE_MAX_ENTRIES = 2048
+
+
+def _cache_key(latitude: float, longitude: float) -> str:
+    """Cache key for a coordinate, rounded to 6 decimal places (~0.1m precision)."""
+    return f"LOCATION#{round(latitude, 6)}#{round(longitude, 6)}"
+
+
+def _local_lookup(key: str) -> Optional[Dict[str, Any]]:
+    data = _local_cache.get(key)
+    if data is not None:
+        _local_cache.move_to_end(key)
+    return data
+
+
+def _local_store(key: str, data: Dict[str, Any]) -> None:
+    _local_cache[key] = data
+    _local_cache.move_to_end(key)
+    if len(_local_cache) > LOCAL_CACHE_MAX_ENTRIES:
+        _local_cache.popitem(last=False)
+
 
 class LocationService:
     """Service for location operations using Google Maps Geocoding API with DynamoDB caching"""
@@ -22,10 +48,9 @@ class LocationService:
     def _get_from_cache(latitude: float, longitude: float) -> Optional[Dict[str, Any]]:
         """Check if location is cached in DynamoDB AddressesTable"""
         try:
-            # Round to 6 decimal places for cache key (~0.1m precision)
             lat_rounded = round(latitude, 6)
             lng_rounded = round(longitude, 6)
-            phone = f"LOCATION#{lat_rounded}#{lng_rounded}"  # Use LOCATION# prefix for cache entries
+            phone = _cache_key(latitude, longitude)
             address_id = "CACHE"
             
             response = dynamodb_client.get_item(
@@ -60,9 +85,7 @@ class LocationService:
     def _save_to_cache(latitude: float, longitude: float, data: Dict[str, Any]) -> None:
         """Save location data to DynamoDB AddressesTable as cache"""
         try:
-            lat_rounded = round(latitude, 6)
-            lng_rounded = round(longitude, 6)
-            phone = f"LOCATION#{lat_rounded}#{lng_rounded}"  # Use LOCATION# prefix
+            phone = _cache_key(latitude, longitude)
             address_id = "CACHE"
             
             # Calculate TTL (30 days from now)
@@ -106,9 +129,14 @@ class LocationService:
         Returns:
             Dict containing latitude, longitude, address, and components
         """
-        # Check cache first
+        # Check the in-process cache, then DynamoDB
+        key = _cache_key(latitude, longitude)
+        cached_data = _local_lookup(key)
+        if cached_data:
+            return cached_data
         cached_data = LocationService._get_from_cache(latitude, longitude)
         if cached_data:
+            _local_store(key, cached_data)
             return cached_data
         
         # Cache miss - call Google Maps API
@@ -213,6 +241,7 @@ class LocationService:
             
             # Save to cache
             LocationService._save_to_cache(latitude, longitude, response_data)
+            _local_store(key, response_data)
             
             return response_data
             
@@ -71,26 +71,42 @@ class OrderAssignmentService:
         })
         logger.info(f"[orderId={order_id}] Status updated to AWAITING_RIDER_ASSIGNMENT (attempt #{attempts})")
 
-        queue_url = os.environ.get('ORDER_ASSIGNMENT_QUEUE_URL')
-        if not queue_url:
-            logger.error(f"[orderId={order_id}] ORDER_ASSIGNMENT_QUEUE_URL not configured")
-            return
-
         try:
-            sqs = boto3.client('sqs')
-            sqs.send_message(
-                QueueUrl=queue_url,
-                MessageBody=json.dumps({
-                    'orderId': order_id,
-                    'restaurantLat': restaurant_lat,
-                    'restaurantLng': restaurant_lng,
-                    'attemptNumber': attempts
-                })
+            OrderAssignmentService.queue_order_for_assignment(
+                order_id, restaurant_lat, restaurant_lng, attempts
             )
             logger.info(f"[orderId={order_id}] Queued for rider assignment retry")
         except Exception as e:
             logger.error(f"[orderId={order_id}] Failed to queue: {str(e)}", exc_info=True)
 
+    @staticmethod
+    def queue_order_for_assignment(
+        order_id: str,
+        restaurant_lat: float,
+        restaurant_lng: float,
+        attempt_number: int,
+    ) -> None:
+        """
+        Hand an order to the queue assignment consumer, which re-checks that it
+        is still AWAITING_RIDER_ASSIGNMENT and runs assign_order_to_rider.
+
+        Raises if the queue is not configured or the send fails.
+        """
+        queue_url = os.environ.get('ORDER_ASSIGNMENT_QUEUE_URL')
+        if not queue_url:
+            raise Exception("ORDER_ASSIGNMENT_QUEUE_URL not configured")
+
+        sqs = boto3.client('sqs')
+        sqs.send_message(
+            QueueUrl=queue_url,
+            MessageBody=json.dumps({
+                'orderId': order_id,
+                'restaurantLat': restaurant_lat,
+                'restaurantLng': restaurant_lng,
+                'attemptNumber': attempt_number
+            })
+        )
+
     @staticmethod
     def assign_order_to_rider(order_id: str, restaurant_lat: float, restaurant_lng: float) -> Optional[str]:
         """
@@ -1,13 +1,33 @@
 """Order service"""
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from aws_lambda_powertools import Logger
 from botocore.exceptions import ClientError
 from models.order import Order
 from utils.dynamodb import dynamodb_client, TABLES
+from utils.dynamodb_helpers import projection_kwargs
 
 logger = Logger()
 
+# Every attribute Order.from_dynamodb_item reads. Reads that only build Order
+# models can project to this and skip the composite GSI keys and any ad-hoc
+# attributes written outside the model.
+ORDER_ATTRIBUTES = (
+    'orderId', 'items', 'createdAt', 'customerPhone', 'receiverPhone', 'restaurantId',
+    'foodTotal', 'deliveryFee', 'platformFee', 'grandTotal', 'status', 'riderId',
+    'riderName', 'restaurantName', 'restaurantImage', 'deliveryAddress',
+    'formattedAddress', 'addressId', 'cookingInstructions', 'paymentId',
+    'paymentMethod', 'paymentChannel', 'rating', 'revenue', 'pickupAddress',
+    'pickupLat', 'pickupLng', 'deliveryLat', 'deliveryLng', 'deliveryOtp',
+    'pickupOtp', 'riderAssignedAt', 'riderPickupAt', 'riderDeliveredAt',
+    'riderCurrentLat', 'riderCurrentLng', 'riderSpeed', 'riderHeading',
+    'riderLocationUpdatedAt', 'riderAssignmentAttempts', 'lastAssignmentAttemptAt',
+    'offeredAt', 'rejectedByRiders', 'calculatedFeeResponse', 'preparationTime',
+    'orderType', 'pickupToken', 'inventoryReverted', 'originalGrandTotal',
+    'prepaidAmount', 'amountDueAtDelivery', 'adjustments', 'wasAdjusted',
+    'internalStatus', 'coinsSpent', 'coinDiscount',
+)
+
 class OrderStatusConflictError(Exception):
     """Raised when a conditional status update fails due to stale client state."""
 
@@ -202,8 +222,18 @@ class OrderService:
             raise Exception(f"Failed to list restaurant orders: {str(e)}")
     
     @staticmethod
-    def list_orders_by_rider(rider_id: str, status: str = None, limit: int = 20) -> List[Order]:
-        """List orders by rider ID using GSI with optional status filter"""
+    def list_orders_by_rider(
+        rider_id: str,
+        status: str = None,
+        limit: int = 20,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Order]:
+        """List orders by rider ID using GSI with optional status filter
+
+        Args:
+            fields: Optional attribute names to project the query to (e.g.
+                ORDER_ATTRIBUTES); unprojected attributes are left unset.
+        """
         try:
             logger.info(f"Listing orders for rider={rider_id} status={status} limit={limit}")
             query_params = {
@@ -211,6 +241,8 @@ class OrderService:
                 'IndexName': 'riderId-statusCreatedAt-index',
                 'ScanIndexForward': False,
             }
+            if fields:
+                query_params.update(projection_kwargs(fields))
             if status:
                 query_params['KeyConditionExpression'] = 'riderId = :riderId AND begins_with(riderStatusCreatedAt, :statusPrefix)'
                 query_params['ExpressionAttributeValues'] = {
@@ -240,9 +272,14 @@ class OrderService:
             raise Exception(f"Failed to list rider orders: {str(e)}")
 
     @staticmethod
-    def get_orders_by_rider(rider_id: str, status: str = None, limit: int = 20) -> List[Order]:
+    def get_orders_by_rider(
+        rider_id: str,
+        status: str = None,
+        limit: int = 20,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Order]:
         """Alias for list_orders_by_rider for backward compatibility"""
-        return OrderService.list_orders_by_rider(rider_id, status, limit)
+        return OrderService.list_orders_by_rider(rider_id, status, limit, fields)
 
     @staticmethod
     def list_orders_by_date_range(
@@ -320,8 +357,14 @@ class OrderService:
             raise Exception(f"Failed to list orders by date range: {str(e)}")
     
     @staticmethod
-    def update_order(order_id: str, updates: dict) -> Order:
-        """Update order with arbitrary fields and update composite keys if status/riderId changes"""
+    def update_order(order_id: str, updates: dict, expected: Optional[dict] = None) -> Order:
+        """Update order with arbitrary fields and update composite keys if status/riderId changes
+
+        Args:
+            expected: Optional {attribute: value} the stored order must still
+                match for the write to apply. A mismatch raises
+                OrderStatusConflictError instead of overwriting.
+        """
         try:
             from utils.dynamodb_helpers import python_to_dynamodb
             # Get current order to access createdAt for composite keys
@@ -397,13 +440,30 @@ class OrderService:
                 update_expr_parts.append("REMOVE " + ", ".join(remove_expr_parts))
             update_expr = " ".join(update_expr_parts)
             
-            dynamodb_client.update_item(
-                TableName=TABLES['ORDERS'],
-                Key={'orderId': {'S': order_id}},
-                UpdateExpression=update_expr,
-                ExpressionAttributeNames=expr_attr_names,
-                ExpressionAttributeValues=expr_attr_values
-            )
+            update_params = {
+                'TableName': TABLES['ORDERS'],
+                'Key': {'orderId': {'S': order_id}},
+                'UpdateExpression': update_expr,
+                'ExpressionAttributeNames': expr_attr_names,
+                'ExpressionAttributeValues': expr_attr_values
+            }
+
+            if expected:
+                condition_parts = []
+                for key, value in expected.items():
+                    expr_attr_names[f"#{key}"] = key
+                    expr_attr_values[f":expected_{key}"] = {'S': str(value)}
+                    condition_parts.append(f"#{key} = :expected_{key}")
+                update_params['ConditionExpression'] = " AND ".join(condition_parts)
+
+            try:
+                dynamodb_client.update_item(**update_params)
+            except ClientError as e:
+                if expected and e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+                    latest_order = OrderService.get_order(order_id)
+                    latest_status = latest_order.status if latest_order else "UNKNOWN"
+                    raise OrderStatusConflictError(latest_status)
+                raise
             
             logger.info(f"[orderId={order_id}] Order update complete")
             return OrderService.get_order(order_id)
@@ -211,11 +211,12 @@ class RestaurantEarningsService:
 
             settled_at = datetime.utcnow().isoformat()
             updated_order_ids: List[str] = []
+            order_id_set = set(order_ids)
 
             for earning in earnings_list:
                 if not earning.order_id:
                     continue
-                if earning.order_id not in order_ids:
+                if earning.order_id not in order_id_set:
                     continue
 
                 try:
@@ -1,19 +1,44 @@
 """Restaurant service"""
-from typing import List, Optional, Set
+from typing import Dict, Iterable, List, Optional, Set
 import math
+import time
 import concurrent.futures
 import requests
 from botocore.exceptions import ClientError
 from models.restaurant import Restaurant
 from utils.dynamodb import dynamodb_client, TABLES
-from utils.dynamodb_helpers import python_to_dynamodb
+from utils.dynamodb_helpers import projection_kwargs, python_to_dynamodb
 from utils.geohash import encode as geohash_encode, get_neighbors, get_precision_for_radius
-from utils.distance import calculate_distance as haversine_distance
+from utils.distance import calculate_distance as haversine_distance, calculate_distances as haversine_distances
 from utils.ssm import get_secret
 from aws_lambda_powertools import Logger
 
 logger = Logger()
 
+# Per-container cache for restaurant lookups: {restaurantId: (expires_at, Restaurant)}.
+# Warm invocations serve hot restaurants from memory; entries are dropped on
+# writes made through this service.
+_restaurant_cache = {}
+RESTAURANT_CACHE_TTL_SECONDS = 30
+
+# Upper bound on concurrent restaurantId-index queries in batch_get_restaurants,
+# however many IDs miss the cache. Keeps a large batch from bursting past the
+# shared DynamoDB client's connection pool or throttling the index.
+RESTAURANT_LOOKUP_CONCURRENCY = 10
+
+# Every attribute Restaurant.from_dynamodb_item reads. Used as the default read
+# projection so unrelated attributes on restaurant items never cross the wire.
+RESTAURANT_ATTRIBUTES = (
+    'PK', 'SK', 'restaurantId', 'name', 'locationId', 'latitude', 'longitude',
+    'isOpen', 'cuisine', 'geohash', 'GSI1PK', 'rating', 'ratedCount',
+    'restaurant_image', 'createdAt', 'closesAt', 'opensAt', 'avgPreparationTime',
+    'fcmToken', 'fcmTokens', 'fcmTokenUpdatedAt', 'position', 'topOfferBanner',
+    'shiftTimings', 'timezone', 'theaterMode', 'gst',
+)
+
+
+_RESTAURANT_PROJECTION = projection_kwargs(RESTAURANT_ATTRIBUTES)
+
 
 class RestaurantService:
     """Service for restaurant operations"""
@@ -114,7 +139,8 @@ class RestaurantService:
             
             # Determine which index and key to use based on precision
             query_params = {
-                'TableName': TABLES['RESTAURANTS']
+                'TableName': TABLES['RESTAURANTS'],
+                **_RESTAURANT_PROJECTION
             }
             
             if precision == 7:
@@ -216,14 +242,15 @@ class RestaurantService:
                         restaurants = future.result()
                         logger.info(f"   Geohash {geohash_queried}: {len(restaurants)} restaurants found")
                         
-                        for restaurant in restaurants:
+                        # Distances for all unseen candidates in one batched haversine pass
+                        candidates = [r for r in restaurants if r.restaurant_id not in seen_ids]
+                        distances = haversine_distances(
+                            latitude, longitude,
+                            [(r.latitude, r.longitude) for r in candidates]
+                        )
+                        
+                        for restaurant, distance in zip(candidates, distances):
                             if restaurant.restaurant_id not in seen_ids:
-                                # Calculate distance
-                                distance = RestaurantService.calculate_distance(
-                                    latitude, longitude,
-                                    restaurant.latitude, restaurant.longitude
-                                )
-                                
                                 logger.info(f"      {restaurant.name}: {distance:.2f}km away")
                                 
                                 # Only include if within max distance
@@ -339,13 +366,51 @@ class RestaurantService:
             return restaurant
         except ClientError as e:
             raise Exception(f"Failed to create restaurant: {str(e)}")
-    
+
     @staticmethod
-    def list_restaurants() -> List[Restaurant]:
-        """List all restaurants (scan - use sparingly)"""
+    def create_restaurant_with_login(restaurant: Restaurant, user_identity: str) -> Restaurant:
+        """Create a restaurant and its login entry atomically in one round-trip.
+
+        Both Puts go through a single TransactWriteItems so a restaurant can
+        never exist without login credentials (or vice versa).
+        """
         try:
+            dynamodb_client.transact_write_items(
+                TransactItems=[
+                    {
+                        'Put': {
+                            'TableName': TABLES['RESTAURANTS'],
+                            'Item': restaurant.to_dynamodb_item()
+                        }
+                    },
+                    {
+                        'Put': {
+                            'TableName': TABLES['RESTAURANT_LOGIN'],
+                            'Item': {
+                                'userIdentity': {'S': user_identity},
+                                'restaurantId': {'S': restaurant.restaurant_id}
+                            }
+                        }
+                    }
+                ]
+            )
+            return restaurant
+        except ClientError as e:
+            raise Exception(f"Failed to create restaurant: {str(e)}")
+
+    @staticmethod
+    def list_restaurants(attributes: Optional[List[str]] = None) -> List[Restaurant]:
+        """List all restaurants (scan - use sparingly)
+
+        Args:
+            attributes: Item attributes to read; defaults to everything the
+                model uses. Pass a narrower list when only a few fields matter.
+        """
+        try:
+            projection = projection_kwargs(attributes) if attributes else _RESTAURANT_PROJECTION
             response = dynamodb_client.scan(
-                TableName=TABLES['RESTAURANTS']
+                TableName=TABLES['RESTAURANTS'],
+                **projection
             )
             
             restaurants = []
@@ -366,7 +431,8 @@ class RestaurantService:
                 KeyConditionExpression='restaurantId = :restaurant_id',
                 ExpressionAttributeValues={
                     ':restaurant_id': {'S': restaurant_id}
-                }
+                },
+                **_RESTAURANT_PROJECTION
             )
             
             items = response.get('Items', [])
@@ -377,9 +443,77 @@ class RestaurantService:
         except ClientError as e:
             raise Exception(f"Failed to get restaurant by ID: {str(e)}")
     
+    @staticmethod
+    def get_restaurant_by_id_cached(restaurant_id: str) -> Optional[Restaurant]:
+        """Get restaurant by ID, served from the in-process cache when fresh.
+
+        Use for read-only display paths that can tolerate a few seconds of
+        staleness; callers that go on to write should use get_restaurant_by_id.
+        """
+        now = time.time()
+        cached = _restaurant_cache.get(restaurant_id)
+        if cached and cached[0] > now:
+            return cached[1]
+
+        restaurant = RestaurantService.get_restaurant_by_id(restaurant_id)
+        if restaurant:
+            _restaurant_cache[restaurant_id] = (now + RESTAURANT_CACHE_TTL_SECONDS, restaurant)
+        return restaurant
+
+    @staticmethod
+    def _lookup_restaurant_or_none(restaurant_id: str) -> Optional[Restaurant]:
+        """get_restaurant_by_id_cached that logs a failed lookup and returns None.
+
+        Keeps one bad lookup in batch_get_restaurants from discarding the
+        rest of the batch.
+        """
+        try:
+            return RestaurantService.get_restaurant_by_id_cached(restaurant_id)
+        except Exception as e:
+            logger.warning(f"Restaurant lookup failed for {restaurant_id}: {str(e)}")
+            return None
+
+    @staticmethod
+    def batch_get_restaurants(restaurant_ids: Iterable[str]) -> Dict[str, Restaurant]:
+        """Fetch many restaurants by ID, each unique ID at most once.
+
+        Restaurants are keyed by geohash (PK) so BatchGetItem cannot address
+        them by ID; instead unique IDs are resolved through the per-container
+        cache and any misses are queried on restaurantId-index in parallel.
+
+        Returns:
+            {restaurantId: Restaurant} for every ID that exists. IDs whose
+            lookup fails are logged and left out.
+        """
+        now = time.time()
+        result = {}
+        misses = []
+        for rid in dict.fromkeys(restaurant_ids):
+            if not rid:
+                continue
+            cached = _restaurant_cache.get(rid)
+            if cached and cached[0] > now:
+                result[rid] = cached[1]
+            else:
+                misses.append(rid)
+
+        if not misses:
+            return result
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(misses), RESTAURANT_LOOKUP_CONCURRENCY)) as executor:
+            restaurants = executor.map(RestaurantService._lookup_restaurant_or_none, misses)
+            result.update((rid, r) for rid, r in zip(misses, restaurants) if r)
+        return result
+
+    @staticmethod
+    def invalidate_cached_restaurant(restaurant_id: str) -> None:
+        """Drop a restaurant from the in-process cache after it changes."""
+        _restaurant_cache.pop(restaurant_id, None)
+
     @staticmethod
     def update_restaurant(restaurant_id: str, updates: dict) -> Restaurant:
         """Update restaurant information"""
+        RestaurantService.invalidate_cached_restaurant(restaurant_id)
         try:
             # First, get the existing restaurant
             existing_restaurant = RestaurantService.get_restaurant_by_id(restaurant_id)
@@ -628,6 +762,7 @@ class RestaurantService:
     @staticmethod
     def add_rating(restaurant_id: str, new_rating: float) -> Restaurant:
         """Add a new rating to restaurant and recompute average + ratedCount."""
+        RestaurantService.invalidate_cached_restaurant(restaurant_id)
         try:
             restaurant = RestaurantService.get_restaurant_by_id(restaurant_id)
             if not restaurant:
@@ -658,6 +793,7 @@ class RestaurantService:
     @staticmethod
     def add_fcm_token(restaurant_id: str, fcm_token: str, updated_at: str) -> Restaurant:
         """Atomically add an FCM token to restaurant's token set."""
+        RestaurantService.invalidate_cached_restaurant(restaurant_id)
         restaurant = RestaurantService.get_restaurant_by_id(restaurant_id)
         if not restaurant:
             raise Exception("Restaurant not found")
@@ -685,6 +821,7 @@ class RestaurantService:
     @staticmethod
     def remove_fcm_token(restaurant_id: str, fcm_token: Optional[str], updated_at: Optional[str]) -> Restaurant:
         """Remove one device token; optionally clear all when token not provided."""
+        RestaurantService.invalidate_cached_restaurant(restaurant_id)
         from utils.datetime_ist import now_ist_iso
         updated_at = updated_at or now_ist_iso()
         restaurant = RestaurantService.get_restaurant_by_id(restaurant_id)
@@ -4,7 +4,8 @@ from botocore.exceptions import ClientError
 from datetime import datetime, timedelta, timezone
 from models.rider import Rider
 from utils.dynamodb import dynamodb_client, TABLES
-from utils.geohash import encode as geohash_encode
+from utils.dynamodb_helpers import coordinate_to_dynamodb, projection_kwargs
+from utils.geohash import encode as geohash_encode, encode_prefixes as geohash_prefixes
 from utils.datetime_ist import now_ist_iso
 from aws_lambda_powertools import Logger
 
@@ -24,6 +25,18 @@ GSI3_GEOHASH_PRECISION = 2
 # table Scan. Overridable per-call when the deployment spans more than one region.
 DEFAULT_RIDER_GSI3_PARTITION = "td"
 
+# Attributes Rider.from_dynamodb_item reads; list endpoints project to these.
+RIDER_ATTRIBUTES = (
+    'riderId', 'phone', 'lat', 'lng', 'speed', 'heading', 'timestamp', 'isActive',
+    'rating', 'ratedCount', 'workingOnOrder', 'lastSeen', 'geohash',
+    'ordersAssignedLast7d', 'assignmentWindowStart', 'firstName', 'lastName',
+)
+_RIDER_PROJECTION = projection_kwargs(RIDER_ATTRIBUTES)
+
+# Page size bounds for list_riders_page.
+DEFAULT_RIDER_PAGE_SIZE = 100
+MAX_RIDER_PAGE_SIZE = 500
+
 logger = Logger()
 
 
@@ -223,6 +236,40 @@ class RiderService:
         except ClientError as e:
             raise Exception(f"Failed to list riders: {str(e)}")
     
+    @staticmethod
+    def list_riders_page(
+        limit: int = DEFAULT_RIDER_PAGE_SIZE,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Rider], Optional[str]]:
+        """List one page of riders.
+
+        Args:
+            limit: Page size, clamped to 1..MAX_RIDER_PAGE_SIZE.
+            cursor: Value returned as next_cursor by the previous page.
+
+        Returns:
+            (riders, next_cursor); next_cursor is None on the last page.
+        """
+        try:
+            scan_kwargs = {
+                'TableName': TABLES['RIDERS'],
+                'Limit': max(1, min(limit, MAX_RIDER_PAGE_SIZE)),
+                **_RIDER_PROJECTION,
+            }
+            if cursor:
+                # The riders table is keyed on riderId alone, so the rider ID
+                # is the whole LastEvaluatedKey.
+                scan_kwargs['ExclusiveStartKey'] = {'riderId': {'S': cursor}}
+
+            response = dynamodb_client.scan(**scan_kwargs)
+            riders = [Rider.from_dynamodb_item(item) for item in response.get('Items', [])]
+
+            last_key = response.get('LastEvaluatedKey')
+            next_cursor = last_key['riderId']['S'] if last_key else None
+            return riders, next_cursor
+        except ClientError as e:
+            raise Exception(f"Failed to list riders: {str(e)}")
+
     @staticmethod
     def update_location(
         rider_id: str,
@@ -236,8 +283,7 @@ class RiderService:
             timestamp = now_ist_iso()
             
             # Geohash for GSI3 partition (rider assignment query)
-            geohash_p7 = geohash_encode(lat, lng, precision=7)
-            geohash_p2 = geohash_p7[:GSI3_GEOHASH_PRECISION]
+            geohash_p7, geohash_p2 = geohash_prefixes(lat, lng, (7, GSI3_GEOHASH_PRECISION))
 
             # Update rider location in riders table
             dynamodb_client.update_item(
@@ -248,8 +294,8 @@ class RiderService:
                     '#timestamp': 'timestamp'
                 },
                 ExpressionAttributeValues={
-                    ':lat': {'N': str(lat)},
-                    ':lng': {'N': str(lng)},
+                    ':lat': {'N': coordinate_to_dynamodb(lat)},
+                    ':lng': {'N': coordinate_to_dynamodb(lng)},
                     ':speed': {'N': str(speed)},
                     ':heading': {'N': str(heading)},
                     ':timestamp': {'S': timestamp},
@@ -311,8 +357,7 @@ class RiderService:
             # If going online and location provided, update location and geohash
             if is_active and lat is not None and lng is not None:
                 # Geohash for GSI3 partition (rider assignment query)
-                geohash_p7 = geohash_encode(lat, lng, precision=7)
-                geohash_p2 = geohash_p7[:GSI3_GEOHASH_PRECISION]
+                geohash_p7, geohash_p2 = geohash_prefixes(lat, lng, (7, GSI3_GEOHASH_PRECISION))
 
                 set_clauses = [
                     'isActive = :active',
@@ -330,8 +375,8 @@ class RiderService:
                 values = {
                     ':active': {'BOOL': is_active},
                     ':lastSeen': {'S': timestamp},
-                    ':lat': {'N': str(lat)},
-                    ':lng': {'N': str(lng)},
+                    ':lat': {'N': coordinate_to_dynamodb(lat)},
+                    ':lng': {'N': coordinate_to_dynamodb(lng)},
                     ':geohash': {'S': geohash_p7},
                     ':gsi3pk': {'S': geohash_p2},
                     ':gsi3sk': {'S': f'RIDER#{rider_id}'},
@@ -425,38 +470,44 @@ class RiderService:
             logger.warning(f"[riderId={rider_id}] _record_session_close failed: {e}")
 
     @staticmethod
-    def set_working_on_order(rider_id: str, order_id: Optional[str]) -> Rider:
-        """Add or clear the order(s) rider is working on"""
+    def set_working_on_order(rider_id: str, order_id: Optional[str], rider: Optional[Rider] = None) -> Rider:
+        """Add or clear the order(s) rider is working on
+
+        Pass ``rider`` when the caller has just read it to skip the re-read of
+        the current workingOnOrder list. Returns the rider as written.
+        """
         try:
             RiderService._ensure_user_rider_exists(rider_id)
             logger.info(f"[orderId={order_id}] Updating rider workingOnOrder for riderId={rider_id}")
-            rider = RiderService.get_rider(rider_id)
-            current_orders = rider.working_on_order if rider else []
 
+            current_orders = []
             if order_id:
+                if rider is None:
+                    rider = RiderService.get_rider(rider_id)
+                current_orders = list(rider.working_on_order) if rider else []
                 if order_id not in current_orders:
                     current_orders.append(order_id)
-            else:
-                current_orders = []
 
             if current_orders:
-                dynamodb_client.update_item(
+                response = dynamodb_client.update_item(
                     TableName=TABLES['RIDERS'],
                     Key={'riderId': {'S': rider_id}},
                     UpdateExpression='SET workingOnOrder = :orderIds',
                     ExpressionAttributeValues={
                         ':orderIds': {'L': [{'S': str(v)} for v in current_orders]}
-                    }
+                    },
+                    ReturnValues='ALL_NEW'
                 )
             else:
-                dynamodb_client.update_item(
+                response = dynamodb_client.update_item(
                     TableName=TABLES['RIDERS'],
                     Key={'riderId': {'S': rider_id}},
-                    UpdateExpression='REMOVE workingOnOrder'
+                    UpdateExpression='REMOVE workingOnOrder',
+                    ReturnValues='ALL_NEW'
                 )
             
             logger.info(f"[orderId={order_id}] Rider workingOnOrder updated for riderId={rider_id}")
-            return RiderService.get_rider(rider_id)
+            return Rider.from_dynamodb_item(response['Attributes'])
         except ClientError as e:
             raise Exception(f"Failed to set working on order: {str(e)}")
 
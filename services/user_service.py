@@ -1,10 +1,19 @@
 """User service"""
-from typing import Optional, List
+from typing import Iterator, Optional, List, Tuple
 from botocore.exceptions import ClientError
 from models.user import User
+from models.rider import Rider
 from utils.dynamodb import dynamodb_client, TABLES
 
 
+# Upper bound on items evaluated per page by the paged Users scans.
+MAX_USER_SCAN_PAGE_SIZE = 500
+
+
+class RiderAlreadyRegisteredError(Exception):
+    """Raised when a signup races a pending or approved rider with the same phone."""
+
+
 class UserService:
     """Service for user operations"""
     
@@ -80,6 +89,45 @@ class UserService:
         except ClientError as e:
             raise Exception(f"Failed to create user: {str(e)}")
 
+    @staticmethod
+    def create_user_and_rider_txn(user: User, rider: Rider) -> User:
+        """Create the Users (auth/KYC) and Riders (operational) rows atomically.
+
+        The Users put is conditioned so a rejected rider can sign up again,
+        but a pending or approved one is never overwritten.
+        """
+        try:
+            dynamodb_client.transact_write_items(
+                TransactItems=[
+                    {
+                        'Put': {
+                            'TableName': TABLES['USERS'],
+                            'Item': user.to_dynamodb_item(),
+                            'ConditionExpression': (
+                                'attribute_not_exists(phone) '
+                                'OR NOT riderStatus IN (:signup_done, :approved)'
+                            ),
+                            'ExpressionAttributeValues': {
+                                ':signup_done': {'S': User.RIDER_STATUS_SIGNUP_DONE},
+                                ':approved': {'S': User.RIDER_STATUS_APPROVED},
+                            },
+                        }
+                    },
+                    {
+                        'Put': {
+                            'TableName': TABLES['RIDERS'],
+                            'Item': rider.to_dynamodb_item(),
+                        }
+                    },
+                ]
+            )
+            return user
+        except ClientError as e:
+            reasons = e.response.get('CancellationReasons') or []
+            if reasons and reasons[0].get('Code') == 'ConditionalCheckFailed':
+                raise RiderAlreadyRegisteredError(user.phone)
+            raise Exception(f"Failed to create rider: {str(e)}")
+
     @staticmethod
     def _upsert_create_from_updates(phone: str, role: str, updates: dict) -> None:
         """Insert (phone, role) if absent. Swallows ConditionalCheckFailed (concurrent create)."""
@@ -251,36 +299,98 @@ class UserService:
                     continue
                 raise Exception("User not found")
 
+    @staticmethod
+    def upsert_fcm_token(phone: str, role: str, fcm_token: str, updated_at: str) -> bool:
+        """Set the FCM token on (phone, role) and mark it active, creating the row if absent.
+
+        One UpdateItem covers both cases; a new row gets the same minimal
+        attributes create_user would write. Returns True if the row was created.
+        """
+        try:
+            response = dynamodb_client.update_item(
+                TableName=TABLES['USERS'],
+                Key={
+                    'phone': {'S': phone},
+                    'role': {'S': role}
+                },
+                UpdateExpression=(
+                    'SET fcmToken = :fcmToken, fcmTokenUpdatedAt = :updatedAt, '
+                    'isActive = :isActive, createdAt = if_not_exists(createdAt, :updatedAt)'
+                ),
+                ExpressionAttributeValues={
+                    ':fcmToken': {'S': fcm_token},
+                    ':updatedAt': {'S': updated_at},
+                    ':isActive': {'BOOL': True}
+                },
+                ReturnValues='UPDATED_OLD'
+            )
+            return 'createdAt' not in response.get('Attributes', {})
+        except ClientError as e:
+            raise Exception(f"Failed to register FCM token: {str(e)}")
+
     @staticmethod
     def get_rider_by_phone(phone: str) -> Optional[User]:
         """Get rider by phone (must have role=RIDER)"""
         return UserService.get_user_by_role(phone, "RIDER")
     
     @staticmethod
-    def list_riders_by_status(status: str) -> list:
-        """List all riders with specific status"""
+    def _riders_by_status_scan_params(status: str) -> dict:
+        return {
+            'TableName': TABLES['USERS'],
+            'FilterExpression': '#role = :role AND #riderStatus = :status',
+            'ExpressionAttributeNames': {
+                '#role': 'role',
+                '#riderStatus': 'riderStatus'
+            },
+            'ExpressionAttributeValues': {
+                ':role': {'S': 'RIDER'},
+                ':status': {'S': status}
+            }
+        }
+
+    @staticmethod
+    def iter_riders_by_status(status: str) -> Iterator[User]:
+        """Yield all riders with specific status, one scan page at a time"""
+        scan_params = UserService._riders_by_status_scan_params(status)
         try:
-            response = dynamodb_client.scan(
-                TableName=TABLES['USERS'],
-                FilterExpression='#role = :role AND #riderStatus = :status',
-                ExpressionAttributeNames={
-                    '#role': 'role',
-                    '#riderStatus': 'riderStatus'
-                },
-                ExpressionAttributeValues={
-                    ':role': {'S': 'RIDER'},
-                    ':status': {'S': status}
-                }
-            )
-            
-            riders = []
-            for item in response.get('Items', []):
-                riders.append(User.from_dynamodb_item(item))
-            
-            return riders
+            while True:
+                response = dynamodb_client.scan(**scan_params)
+                for item in response.get('Items', []):
+                    yield User.from_dynamodb_item(item)
+                if 'LastEvaluatedKey' not in response:
+                    break
+                scan_params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+        except ClientError as e:
+            raise Exception(f"Failed to list riders: {str(e)}")
+
+    @staticmethod
+    def list_riders_by_status_page(
+        status: str,
+        limit: int,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[User], Optional[str]]:
+        """List one page of riders with specific status.
+
+        `limit` caps the Users items evaluated (clamped to 1..MAX_USER_SCAN_PAGE_SIZE),
+        not the riders returned, so a page may be short or even empty while
+        next_cursor is still set. Callers keep paging until next_cursor is None.
+        """
+        scan_params = UserService._riders_by_status_scan_params(status)
+        scan_params['Limit'] = max(1, min(limit, MAX_USER_SCAN_PAGE_SIZE))
+        if cursor:
+            # Users is keyed on (phone, role); the cursor carries both.
+            phone, _, role = cursor.rpartition(':')
+            scan_params['ExclusiveStartKey'] = {'phone': {'S': phone}, 'role': {'S': role}}
+        try:
+            response = dynamodb_client.scan(**scan_params)
         except ClientError as e:
             raise Exception(f"Failed to list riders: {str(e)}")
 
+        riders = [User.from_dynamodb_item(item) for item in response.get('Items', [])]
+        last_key = response.get('LastEvaluatedKey')
+        next_cursor = f"{last_key['phone']['S']}:{last_key['role']['S']}" if last_key else None
+        return riders, next_cursor
+
     @staticmethod
     def get_rider_by_aadhar(aadhar_number: str) -> Optional[User]:
         """Get rider by Aadhar number (role=RIDER)"""
@@ -1,8 +1,12 @@
 """IST (Indian Standard Time) helpers for storing dates in the database."""
+import time
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
 IST = ZoneInfo("Asia/Kolkata")
+# IST is a fixed UTC+05:30 with no DST, so wall-clock fields can be derived
+# from the epoch directly.
+_IST_OFFSET_SECONDS = 5 * 3600 + 30 * 60
 
 
 def now_ist_iso() -> str:
@@ -12,7 +16,10 @@ def now_ist_iso() -> str:
 
 def now_ist_strftime(fmt: str) -> str:
     """Current time in IST formatted by fmt (e.g. %Y%m%d-%H%M%S for file keys)."""
-    return datetime.now(IST).strftime(fmt)
+    if '%z' in fmt or '%Z' in fmt:
+        return datetime.now(IST).strftime(fmt)
+    # time.strftime on a shifted struct_time skips building an aware datetime.
+    return time.strftime(fmt, time.gmtime(time.time() + _IST_OFFSET_SECONDS))
 
 
 def epoch_ms_to_ist_iso(ms: int) -> str:
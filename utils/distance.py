@@ -1,5 +1,6 @@
 """Distance calculation utilities using Haversine formula"""
 import math
+from typing import List, Tuple
 
 
 def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -26,3 +27,37 @@ def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     distance = R * c
     
     return distance
+
+
+def calculate_distances(lat1: float, lon1: float, points: List[Tuple[float, float]]) -> List[float]:
+    """
+    Calculate Haversine distances from one origin to many coordinates
+    
+    Origin terms (radians, cosine) are computed once for the whole batch
+    instead of once per pair as calculate_distance does.
+    
+    Args:
+        lat1, lon1: Origin coordinate
+        points: List of (latitude, longitude) tuples
+        
+    Returns:
+        Distances in kilometers, in the same order as points
+    """
+    R = 6371  # Earth's radius in km
+    
+    rad = math.radians
+    sin = math.sin
+    cos = math.cos
+    lat1_rad = rad(lat1)
+    cos_lat1 = cos(lat1_rad)
+    lon1_rad = rad(lon1)
+    
+    distances = []
+    for lat2, lon2 in points:
+        lat2_rad = rad(lat2)
+        sin_dlat = sin((lat2_rad - lat1_rad) / 2)
+        sin_dlon = sin((rad(lon2) - lon1_rad) / 2)
+        a = sin_dlat * sin_dlat + cos_lat1 * cos(lat2_rad) * sin_dlon * sin_dlon
+        distances.append(R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a)))
+    
+    return distances
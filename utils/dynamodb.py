@@ -1,11 +1,25 @@
 """DynamoDB utility functions"""
 import os
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 
-# Initialize DynamoDB client
-dynamodb_client = boto3.client('dynamodb')
+# Initialize DynamoDB client once per container; every service shares it.
+# The pool is sized for the thread-pool fan-outs in the services (the
+# botocore default of 10 would make extra workers wait on a connection).
+# Each fan-out caps its own workers; the widest is analytics at 22, the
+# deepest nesting (rider orders -> restaurant lookups) tops out at 2 + 10,
+# and earnings runs up to 16 per-day queries or settlement chunks at once, so
+# 64 leaves slack for a post-delivery batch running alongside.
+dynamodb_client = boto3.client(
+    'dynamodb',
+    config=Config(
+        max_pool_connections=64,
+        retries={'mode': 'adaptive'},
+        tcp_keepalive=True,
+    ),
+)
 
 # Match template.yaml: TableName = !Sub 'food-delivery-...-${Environment}'
 # If *TABLE_NAME is unset, default always includes ENVIRONMENT suffix (never bare names).
@@ -1,6 +1,25 @@
 """Helper functions for DynamoDB data type conversions"""
 
 
+def projection_kwargs(attributes) -> dict:
+    """Build ProjectionExpression kwargs, aliasing every name (several are reserved words)."""
+    names = {f'#p{i}': attr for i, attr in enumerate(attributes)}
+    return {
+        'ProjectionExpression': ', '.join(names),
+        'ExpressionAttributeNames': names,
+    }
+
+
+def coordinate_to_dynamodb(value) -> str:
+    """Format a lat/lng as a DynamoDB N string at 6 decimal places (~11 cm).
+
+    str(float) can emit up to 17 significant digits, well past GPS accuracy;
+    trailing zeros are trimmed so e.g. 12.9716 stays "12.9716".
+    """
+    text = format(float(value), '.6f').rstrip('0').rstrip('.')
+    return '0' if text == '-0' else text
+
+
 def python_to_dynamodb(obj):
     """
     Convert Python object to DynamoDB format
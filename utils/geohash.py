@@ -1,5 +1,6 @@
 """Geohash utility functions for spatial indexing"""
 import math
+from functools import lru_cache
 from typing import List, Tuple
 
 
@@ -55,6 +56,19 @@ def encode(latitude: float, longitude: float, precision: int = 7) -> str:
     return ''.join(geohash)
 
 
+def encode_prefixes(
+    latitude: float, longitude: float, precisions: Tuple[int, ...] = (4, 5, 6, 7)
+) -> Tuple[str, ...]:
+    """
+    Geohashes of several precisions for one point, in the order requested
+
+    Encodes once at the highest precision and slices: a geohash's first n
+    characters are exactly its precision-n geohash.
+    """
+    full = encode(latitude, longitude, max(precisions))
+    return tuple(full[:p] for p in precisions)
+
+
 def _decode_ranges(geohash: str) -> Tuple[Tuple[float, float], Tuple[float, float]]:
     """Decode geohash to its latitude/longitude bounds."""
     lat_range = [-90.0, 90.0]
@@ -114,6 +128,13 @@ def get_neighbors(geohash: str) -> List[str]:
     Returns:
         List of 8 neighboring geohashes (N, NE, E, SE, S, SW, W, NW)
     """
+    return list(_neighbors(geohash))
+
+
+@lru_cache(maxsize=4096)
+def _neighbors(geohash: str) -> Tuple[str, ...]:
+    """Neighbours are a pure function of the cell, so warm containers reuse them
+    instead of re-running 8 decode/encode passes per nearby search."""
     lat_range, lon_range = _decode_ranges(geohash)
     lat = (lat_range[0] + lat_range[1]) / 2
     lon = (lon_range[0] + lon_range[1]) / 2
@@ -143,7 +164,7 @@ def get_neighbors(geohash: str) -> List[str]:
         if neighbor_geohash not in neighbors and neighbor_geohash != geohash:
             neighbors.append(neighbor_geohash)
     
-    return neighbors
+    return tuple(neighbors)
 
 
 def get_precision_for_radius(radius_km: float) -> int: